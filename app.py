@@ -7,14 +7,20 @@ import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from loguru import logger
 
 from core.settings import settings
-from core.logger import setup_logging
+from core.logger import setup_logging, shutdown_logging
 from core.db import init_database, close_database
-from middleware.error_handler import error_handler_middleware
-from middleware.logging import logging_middleware
+from middleware.error_handler import ErrorHandlerMiddleware
+from middleware.logging import LoggingMiddleware
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.replica import ReplicaStickyMiddleware
 from modules.echo.router import router as echo_router
+from modules.echo.services import echo_service
+from modules.echo.funcs import pipeline as processor_pipeline
 
 # Loglashni sozlash
 setup_logging()
@@ -31,14 +37,24 @@ async def lifespan(app: FastAPI):
         logger.error("❌ Ma'lumotlar bazasini ishga tushirib bo‘lmadi. Ilova to‘xtatildi.")
         raise RuntimeError("Ma'lumotlar bazasi ishga tushmadi")
     
+    # Xabarlarni qayta ishlash zanjiri (og‘ir qayta ishlovchilar uchun jarayonlar pool'i)
+    processor_pipeline.start(settings.ECHO_PROCESSOR_WORKERS)
+    
+    # Echo yozuvlarini paketlab yozish (ECHO_WRITE_BATCHING yoqilgan bo‘lsa)
+    await echo_service.start_write_batching()
+    
     logger.info("✅ Ilova ishga tayyor")
     
     yield
     
     # To‘xtatish
     logger.info("🛑 Ilova to‘xtatilmoqda...")
+    # Navbatdagi yozuvlar baza yopilishidan oldin yozib tugatiladi
+    await echo_service.stop_write_batching()
+    processor_pipeline.stop()
     await close_database()
     logger.info("👋 Ilova muvaffaqiyatli to‘xtatildi")
+    shutdown_logging()
 
 
 # Ilovani yaratish
@@ -51,9 +67,24 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Middleware'lar (tartib muhim!)
-app.middleware("http")(error_handler_middleware)
-app.middleware("http")(logging_middleware)
+# Middleware'lar (tartib muhim! oxirgi qo‘shilgani eng tashqi qatlam)
+app.add_middleware(ErrorHandlerMiddleware)
+app.add_middleware(LoggingMiddleware)
+
+# Replikalar bo‘lsa - yozgan mijoz qisqa vaqt asosiy bazadan o‘qiydi
+if settings.DB_READ_REPLICA_URLS:
+    app.add_middleware(ReplicaStickyMiddleware, max_age=settings.DB_REPLICA_STICKY_SECONDS)
+
+# Javoblarni siqish
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+    )
 
 # CORS sozlamalari
 app.add_middleware(
@@ -64,6 +95,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrikalar eng tashqi qatlamda - boshqa middleware'lar vaqti ham hisobga olinadi
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Routerlarni ulash
 app.include_router(echo_router, prefix="/api/echo", tags=["echo"])
 
@@ -72,6 +107,7 @@ app.include_router(echo_router, prefix="/api/echo", tags=["echo"])
 async def health_check():
     """Xizmat va ma'lumotlar bazasi holatini tekshirish"""
     from core.db import check_database_connection
+    from core.cache import cache_stats
     
     db_status = await check_database_connection()
     
@@ -79,10 +115,20 @@ async def health_check():
         "status": "ok" if db_status else "warning",
         "service": settings.APP_NAME,
         "version": settings.APP_VERSION,
-        "database": "ulandi" if db_status else "ulanmadi"
+        "database": "ulandi" if db_status else "ulanmadi",
+        "cache": cache_stats()
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus uchun metrikalar (matn formati)"""
+        from core.metrics import render_metrics
+        
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Ilovaning asosiy endpointi"""
@@ -0,0 +1,4 @@
+"""
+Ishlash samaradorligi benchmark'lari
+Ishga tushirish: python -m benchmarks.<skript> --help
+"""
@@ -0,0 +1,84 @@
+"""
+Siqish darajalari: CPU vaqti va javob hajmi (CompressionMiddleware kodlovchilari)
+
+    python -m benchmarks.bench_compression --items 100 --message-size 1000
+
+Yuk - GET /api/echo/ ning 100 elementli sahifasi. brotli va zstd
+o'rnatilgan bo'lsagina o'lchanadi
+"""
+
+import argparse
+import random
+import uuid
+from datetime import datetime, timezone
+
+from benchmarks.common import per_call, print_table
+
+LEVELS = {
+    "gzip": [1, 3, 6, 9],
+    "br": [0, 4, 6, 11],
+    "zstd": [1, 3, 9, 19],
+}
+
+WORDS = ["salom", "dunyo", "echo", "xabar", "test", "qidiruv", "sahifa", "kategoriya", "ma'lumot", "tizim"]
+
+
+def make_page(items: int, message_size: int) -> bytes:
+    from modules.echo.schemas import EchoResponse
+    from shared.schemas.common import PaginatedResponse, PaginationParams
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    echos = []
+    for _ in range(items):
+        message = " ".join(rng.choice(WORDS) for _ in range(message_size // 5))[:message_size]
+        echos.append(EchoResponse(
+            id=uuid.uuid4(), created_at=now, updated_at=now, message=message,
+            category=rng.choice(["general", "demo"]), processed_message=message[::-1],
+            is_protected=False,
+        ))
+    page = PaginatedResponse[EchoResponse].create(echos, 10000, PaginationParams(page_size=items))
+    return page.model_dump_json().encode()
+
+
+def encoder_factory(encoding: str, level: int):
+    from middleware.compression import CompressionMiddleware
+
+    middleware = CompressionMiddleware(
+        app=None, gzip_level=level, brotli_quality=level, zstd_level=level
+    )
+    return middleware.encoders.get(encoding)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--message-size", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    body = make_page(args.items, args.message_size)
+    rows = [("siqilmagan", {"bayt": len(body)})]
+    for encoding, levels in LEVELS.items():
+        for level in levels:
+            factory = encoder_factory(encoding, level)
+            if factory is None:
+                continue
+
+            def compress():
+                encoder = factory()
+                return encoder.compress(body) + encoder.finish()
+
+            seconds = per_call(compress, args.number)
+            size = len(compress())
+            rows.append((f"{encoding} {level}", {
+                "bayt": size,
+                "nisbat": len(body) / size,
+                "ms": seconds * 1000,
+                "MB/s": len(body) / seconds / 1e6,
+            }))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+POST /api/echo/ : bitta yozuvning kechikishi va SQL so'rovlari soni
+
+    python -m benchmarks.bench_create --requests 1000 --concurrency 1
+
+"SQL/so'rov" - bitta yaratishda bazaga yuborilgan SQL'lar (commit'dan tashqari).
+INSERT ... RETURNING bilan u 1 ga teng: refresh uchun qo'shimcha SELECT yo'q
+"""
+
+from benchmarks.common import app_client, engine_variants, run, run_load
+
+VARIANTS = engine_variants({"": {"APP_ECHO_WRITE_BATCHING": "false"}})
+
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=1)
+
+
+async def measure(args):
+    from sqlalchemy import event
+    from core.db import engine
+
+    statements = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    async with app_client() as client:
+        for i in range(10):
+            await client.post("/api/echo/", json={"message": f"isitish {i}"})
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        result = await run_load(
+            lambda i: client.post("/api/echo/", json={"message": f"xabar {i}", "category": "demo"}),
+            args.requests,
+            args.concurrency,
+        )
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    return {**result, "SQL/so'rov": statements / args.requests}
+
+
+if __name__ == "__main__":
+    run(__doc__, VARIANTS, measure, add_arguments)
@@ -0,0 +1,34 @@
+"""
+Loglashning so'rov/s ga ta'siri: sinxron sink'lar, navbatli yozish (LOG_ASYNC),
+JSON access log va per-request loglarni o'chirish (ACCESS_LOG_LEVEL)
+
+    python -m benchmarks.bench_logging --requests 5000 --concurrency 50
+
+Bazaga murojaat qilmaydigan GET / yuklanadi - farq faqat loglash narxi.
+Konsol chiqishi bola jarayonda /dev/null ga, fayllar vaqtinchalik papkaga yoziladi
+"""
+
+from benchmarks.common import app_client, run, run_load
+
+VARIANTS = {
+    "sinxron": {"APP_LOG_ASYNC": "false"},
+    "navbatli": {"APP_LOG_ASYNC": "true"},
+    "navbatli json": {"APP_LOG_ASYNC": "true", "APP_ACCESS_LOG_FORMAT": "json"},
+    "access log yo'q": {"APP_LOG_ASYNC": "true", "APP_ACCESS_LOG_LEVEL": "WARNING"},
+}
+
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+
+
+async def measure(args):
+    async with app_client() as client:
+        for _ in range(100):
+            await client.get("/")
+        return await run_load(lambda i: client.get("/"), args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    run(__doc__, VARIANTS, measure, add_arguments)
@@ -0,0 +1,106 @@
+"""
+Middleware qatlamlarining so'rov boshiga narxi (yuqori parallellikda)
+
+    python -m benchmarks.bench_middleware --requests 20000 --concurrency 200
+
+"oldingi" - xatolar va loglash middleware'larining app.middleware("http")
+(BaseHTTPMiddleware) ko'rinishidagi oldingi nusxasi, "ASGI" - hozirgi
+ErrorHandlerMiddleware va LoggingMiddleware. Loguru sink'lari olib tashlanadi:
+o'lchanadigan narsa - middleware mexanizmi, log yozish emas
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import print_table, run_load
+
+
+async def old_error_handler(request, call_next):
+    from fastapi import HTTPException
+    from fastapi.responses import JSONResponse
+
+    try:
+        return await call_next(request)
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"status": "error", "message": e.detail, "error_code": e.status_code},
+        )
+    except Exception:
+        return JSONResponse(
+            status_code=500,
+            content={"status": "error", "message": "Ichki server xatosi", "error_code": 500},
+        )
+
+
+async def old_logging(request, call_next):
+    from loguru import logger
+
+    start_time = time.time()
+    client_ip = request.client.host if request.client else "nomalum"
+    logger.info(
+        f"→ {request.method} {request.url.path} "
+        f"mijoz: {client_ip} "
+        f"User-Agent: {request.headers.get('user-agent', 'nomalum')}"
+    )
+    response = await call_next(request)
+    process_time = time.time() - start_time
+    logger.info(
+        f"← {request.method} {request.url.path} "
+        f"→ {response.status_code} "
+        f"{process_time:.3f} soniyada bajarildi"
+    )
+    response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-Request-ID"] = str(id(request))
+    return response
+
+
+def make_app(stack: str):
+    from fastapi import FastAPI
+    from middleware.error_handler import ErrorHandlerMiddleware
+    from middleware.logging import LoggingMiddleware
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if stack == "oldingi":
+        app.middleware("http")(old_error_handler)
+        app.middleware("http")(old_logging)
+    elif stack == "ASGI":
+        app.add_middleware(ErrorHandlerMiddleware)
+        app.add_middleware(LoggingMiddleware)
+    return app
+
+
+async def measure(stack: str, requests: int, concurrency: int):
+    import httpx
+
+    app = make_app(stack)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):
+            await client.get("/ping")
+        return await run_load(lambda i: client.get("/ping"), requests, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    from loguru import logger
+    logger.remove()
+
+    rows = []
+    for stack in ["middleware'siz", "oldingi", "ASGI"]:
+        rows.append((stack, asyncio.run(measure(stack, args.requests, args.concurrency))))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
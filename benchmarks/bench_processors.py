@@ -0,0 +1,112 @@
+"""
+Xabarlarni qayta ishlovchilar mikrobenchmark'i
+
+    python -m benchmarks.bench_processors --batch 1000 --workers 4
+
+1) Har bir ro'yxatdagi qayta ishlovchi: har xabar alohida chaqiruvda va butun paket bitta chaqiruvda
+2) Og'ir (cpu_bound) zanjir: joyida va ProcessPoolExecutor'da; "loop blok ms" -
+   shu vaqt ichida event loop javob bermagan eng uzun oraliq
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+import time
+
+from loguru import logger
+
+from benchmarks.common import per_call, print_table
+from modules.echo.funcs import PROCESSORS, Processor, ProcessorPipeline, register_processor
+
+
+@register_processor
+class HashProcessor(Processor):
+    """Og'ir o'zgartirish namunasi: sha256 ni ko'p marta takrorlash"""
+    name = "bench-hash"
+    cpu_bound = True
+    rounds = 200
+
+    def process(self, message: str) -> str:
+        data = message.encode()
+        for _ in range(self.rounds):
+            data = hashlib.sha256(data).digest()
+        return data.hex()
+
+
+async def run_pipeline(pipeline: ProcessorPipeline, messages):
+    """pipeline.run vaqti va event loop'ning eng uzun to'xtab qolishi"""
+    loop = asyncio.get_running_loop()
+    longest = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal longest
+        last = loop.time()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = loop.time()
+            longest = max(longest, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await pipeline.run(messages)
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return elapsed, longest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--message-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    # loguru'ning odatiy DEBUG sink'i process_many dagi lazy debug yozuvini ham
+    # formatlaydi - o'lchovga log narxi qo'shilmasligi uchun INFO
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    messages = [(f"  Xabar {i} " * args.message_size)[:args.message_size] for i in range(args.batch)]
+
+    rows = []
+    for name, processor in PROCESSORS.items():
+        if processor.cpu_bound:
+            continue
+        single = per_call(lambda: [processor.process_many([m])[0] for m in messages], args.number)
+        batched = per_call(lambda: processor.process_many(messages), args.number)
+        rows.append((name, {
+            "bittalab mks/xabar": single / args.batch * 1e6,
+            "paket mks/xabar": batched / args.batch * 1e6,
+        }))
+    chain = ProcessorPipeline(["strip", "lower", "reverse"])
+    rows.append(("strip+lower+reverse", {
+        "paket mks/xabar": per_call(lambda: chain.process_many(messages), args.number) / args.batch * 1e6,
+    }))
+    print_table(rows)
+    print()
+
+    rows = []
+    for workers in (0, args.workers):
+        pipeline = ProcessorPipeline(["bench-hash"], offload_min_batch=1)
+        pipeline.start(workers)
+        try:
+            # Isitish: jarayonlar ishga tushadi
+            asyncio.run(run_pipeline(pipeline, messages[:workers * 2 or 1]))
+            elapsed, longest = asyncio.run(run_pipeline(pipeline, messages))
+        finally:
+            pipeline.stop()
+        rows.append((f"bench-hash workers={workers}", {
+            "ms/paket": elapsed * 1000,
+            "loop blok ms": longest * 1000,
+        }))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
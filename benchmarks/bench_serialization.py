@@ -0,0 +1,83 @@
+"""
+Sahifani serializatsiya qilish: bitta element narxi (mikrobenchmark)
+
+    python -m benchmarks.bench_serialization --items 100
+
+"oldin" - EchoResponse'ni validatsiya bilan qurish, so'ng FastAPI'ning
+response_model yo'li (qayta validatsiya, jsonable serializatsiya, json.dumps).
+"hozir" - to_response (model_construct) va model_response (model_dump_json)
+"""
+
+import argparse
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from benchmarks.common import per_call, print_table
+
+
+def make_rows(items: int, message_size: int):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    message = ("salom dunyo " * message_size)[:message_size]
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), created_at=now, updated_at=now, message=message,
+            category="demo", processed_message=message[::-1], is_protected=False,
+        )
+        for _ in range(items)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--message-size", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    from fastapi.utils import create_response_field
+    from modules.echo.schemas import EchoResponse
+    from modules.echo.services import to_response
+    from shared.schemas.common import PaginatedResponse, PaginationParams
+    from utils.helpers import model_response
+
+    rows = make_rows(args.items, args.message_size)
+    pagination = PaginationParams(page_size=args.items)
+    page_model = PaginatedResponse[EchoResponse]
+    field = create_response_field(name="response", type_=page_model)
+
+    def before() -> bytes:
+        items = [
+            EchoResponse(
+                id=row.id, created_at=row.created_at, updated_at=row.updated_at,
+                message=row.message, category=row.category,
+                processed_message=row.processed_message, is_protected=row.is_protected,
+            )
+            for row in rows
+        ]
+        page = page_model.create(items, 10000, pagination)
+        value, errors = field.validate(page, {}, loc=("response",))
+        assert not errors
+        content = field.serialize(value, mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def after() -> bytes:
+        items = [to_response(row) for row in rows]
+        page = page_model.create(items, 10000, pagination)
+        return model_response(page).body
+
+    assert json.loads(before()) == json.loads(after())
+
+    results = []
+    for name, fn in [("oldin", before), ("hozir", after)]:
+        seconds = per_call(fn, args.number)
+        results.append((name, {
+            "ms/sahifa": seconds * 1000,
+            "mks/element": seconds / args.items * 1e6,
+        }))
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
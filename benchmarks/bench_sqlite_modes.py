@@ -0,0 +1,55 @@
+"""
+SQLite: odatiy rejim va SQLITE_TUNED (WAL, PRAGMA'lar, yagona yozuvchi, o'quvchilar pool'i)
+
+    python -m benchmarks.bench_sqlite_modes --requests 2000 --concurrency 50
+
+Parallel yozish, parallel o'qish va aralash (har 4-so'rov yozish) yuklamalari.
+Odatiy rejimda parallel yozuvlar "database is locked" bilan tushishi mumkin - xatolar ustuni
+"""
+
+from benchmarks.common import app_client, run, run_load, seed
+
+# Paketlab yozish va kesh o'chirilgan - har bir so'rov bazaga alohida boradi
+BASE = {"APP_ECHO_WRITE_BATCHING": "false", "APP_ECHO_CACHE_ENABLED": "false"}
+
+VARIANTS = {
+    "odatiy": {**BASE, "APP_SQLITE_TUNED": "false"},
+    "tuned": {**BASE, "APP_SQLITE_TUNED": "true"},
+}
+
+
+def add_arguments(parser):
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+
+
+def prefixed(prefix: str, result: dict) -> dict:
+    return {
+        f"{prefix} {key}": value
+        for key, value in result.items()
+        if key in ("so'rov/s", "p99 ms", "xatolar")
+    }
+
+
+async def measure(args):
+    async with app_client() as client:
+        await seed(client, args.rows)
+
+        def write(i):
+            return client.post("/api/echo/", json={"message": f"xabar {i}", "category": "demo"})
+
+        def read(i):
+            return client.get("/api/echo/", params={"page_size": 20, "category": "demo"})
+
+        def mixed(i):
+            return write(i) if i % 4 == 0 else read(i)
+
+        result = {}
+        for name, request in [("yozish", write), ("o'qish", read), ("aralash", mixed)]:
+            result.update(prefixed(name, await run_load(request, args.requests, args.concurrency)))
+        return result
+
+
+if __name__ == "__main__":
+    run(__doc__, VARIANTS, measure, add_arguments)
@@ -0,0 +1,32 @@
+"""
+Parallel POST /api/echo/ : alohida yozuvlar va mikro-paketlab yozish (ECHO_WRITE_BATCHING)
+
+    python -m benchmarks.bench_write_batching --requests 5000 --concurrency 100
+"""
+
+from benchmarks.common import app_client, engine_variants, run, run_load
+
+VARIANTS = engine_variants({
+    "alohida": {"APP_ECHO_WRITE_BATCHING": "false"},
+    "paketlab": {"APP_ECHO_WRITE_BATCHING": "true"},
+})
+
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+
+
+async def measure(args):
+    async with app_client() as client:
+        for i in range(10):
+            await client.post("/api/echo/", json={"message": f"isitish {i}"})
+        return await run_load(
+            lambda i: client.post("/api/echo/", json={"message": f"xabar {i}", "category": "demo"}),
+            args.requests,
+            args.concurrency,
+        )
+
+
+if __name__ == "__main__":
+    run(__doc__, VARIANTS, measure, add_arguments)
@@ -0,0 +1,126 @@
+"""
+Yozuvlarni mikro-paketlarga yig'uvchi (write-behind) asyncio navbati
+Parallel kelgan alohida yozuvlar bitta tranzaksiyada yoziladi
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+from loguru import logger
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Navbatni to'xtatish belgisi
+_STOP = object()
+
+
+class WriteBatcher(Generic[T, R]):
+    """
+    Elementlarni max_delay oynasi yoki max_size soni to'lguncha yig'ib,
+    flush funksiyasiga bitta ro'yxat qilib beradi
+    flush natijalar ro'yxatini kirish tartibida qaytarishi kerak;
+    har bir chaqiruvchi o'z natijasini oladi.
+    Navbat max_queue bilan chegaralangan: to'lganda element navbatsiz, darhol
+    flush([element]) orqali yoziladi - yuklama oshganda qo'shimcha kechikish
+    va xotira o'smaydi
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[List[R]]],
+        max_size: int = 100,
+        max_delay: float = 0.005,
+        name: str = "batcher",
+        max_queue: int = 1000,
+    ):
+        self._flush = flush
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.name = name
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Fon vazifasini ishga tushirish"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"{self.name}: paketlab yozish yoqildi (max_size={self.max_size}, max_delay={self.max_delay}s)")
+
+    async def stop(self) -> None:
+        """Yangi elementlarni qabul qilishni to'xtatish va navbatni oxirigacha yozish"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(_STOP)
+        await task
+        logger.info(f"{self.name}: navbat yakunlandi")
+
+    async def submit(self, item: T) -> R:
+        """Elementni navbatga qo'yish va uning natijasini kutish"""
+        if self._task is None:
+            raise RuntimeError(f"{self.name} ishga tushirilmagan")
+        if self._queue.full():
+            # Ortiqcha yuklama: navbatda kutmasdan alohida yozish
+            results = await self._flush([item])
+            return results[0]
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _collect(self, first: Tuple[T, asyncio.Future]) -> Tuple[list, bool]:
+        """Birinchi elementdan keyin oyna yopilguncha yoki paket to'lguncha yig'ish"""
+        loop = asyncio.get_running_loop()
+        batch = [first]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_size:
+            try:
+                entry = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    async def _write(self, batch: list) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self._flush(items)
+        except Exception as e:
+            logger.error(f"{self.name}: {len(items)} ta elementli paketni yozishda xatolik: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                break
+            batch, stopping = await self._collect(entry)
+            await self._write(batch)
+
+        # To'xtash belgisidan keyin qolgan elementlar ham yoziladi
+        while not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not _STOP:
+                batch, _ = await self._collect(entry)
+                await self._write(batch)
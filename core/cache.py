@@ -0,0 +1,213 @@
+"""
+Kesh qatlami: umumiy interfeys, jarayon ichidagi LRU+TTL kesh va Redis adapteri
+Keshlar nomi bo'yicha ro'yxatga olinadi, statistikasi cache_stats() orqali olinadi
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Type
+from loguru import logger
+from pydantic import BaseModel
+
+from core.settings import settings
+
+# Kalit keshda yo'qligini bildiruvchi belgi (None - saqlangan qiymat bo'lishi mumkin)
+MISSING = object()
+
+# Yaratilgan keshlar (statistika uchun)
+_caches: Dict[str, "CacheBackend"] = {}
+
+
+class CacheBackend:
+    """Kesh backend'lari uchun asosiy interfeys"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Any:
+        """Qiymatni olish; topilmasa MISSING qaytariladi"""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Qiymatni ttl sekundga saqlash"""
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        """Kalitlarni o'chirish (invalidatsiya)"""
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """Keshni to'liq tozalash"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction hisoblagichlari"""
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class NullCache(CacheBackend):
+    """Hech narsa saqlamaydigan kesh (kesh o'chirilganda)"""
+
+    async def get(self, key: str) -> Any:
+        self.misses += 1
+        return MISSING
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """
+    Jarayon ichidagi LRU + TTL kesh
+    max_size dan oshganda eng uzoq ishlatilmagan yozuv chiqariladi.
+    Har bir worker o'z nusxasiga ega - boshqa worker'lardagi o'zgarishlar
+    faqat TTL tugaganda ko'rinadi
+    """
+
+    def __init__(self, name: str, max_size: int = 10000):
+        super().__init__(name)
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "size": len(self._data), "max_size": self.max_size}
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis (yoki Redis bilan mos) server ustidagi kesh
+    Klient get/set(px=...)/delete/scan_iter usullariga ega bo'lishi kerak
+    (redis.asyncio.Redis yoki mahalliy test o'rinbosari)
+    Chiqarishni (eviction) server boshqaradi.
+    Qiymatlar JSON ko'rinishida saqlanadi (pickle emas - umumiy serverdagi kalitga
+    yoza oladigan har kim ilovada kod bajara olmasligi uchun): model berilsa
+    model_dump_json/model_validate_json, aks holda oddiy JSON; None - "null"
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client: Any,
+        prefix: Optional[str] = None,
+        model: Optional[Type[BaseModel]] = None,
+    ):
+        super().__init__(name)
+        self.client = client
+        self.prefix = prefix or f"{name}:"
+        self.model = model
+
+    @classmethod
+    def from_url(cls, name: str, url: str, model: Optional[Type[BaseModel]] = None) -> "RedisCache":
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis uchun 'redis' paketini o'rnating") from e
+        return cls(name, aioredis.from_url(url), model=model)
+
+    def _dumps(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            return value.model_dump_json().encode("utf-8")
+        return json.dumps(value).encode("utf-8")
+
+    def _loads(self, raw: bytes) -> Any:
+        if self.model is None or raw == b"null":
+            return json.loads(raw)
+        return self.model.model_validate_json(raw)
+
+    async def get(self, key: str) -> Any:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return MISSING
+        try:
+            value = self._loads(raw)
+        except ValueError:
+            # Eski formatdagi yoki buzilgan yozuv - keshda yo'q deb hisoblanadi
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.client.set(self.prefix + key, self._dumps(value), px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+def create_cache(
+    name: str,
+    max_size: int,
+    enabled: bool = True,
+    model: Optional[Type[BaseModel]] = None,
+) -> CacheBackend:
+    """
+    Sozlamalardagi CACHE_BACKEND bo'yicha nomlangan kesh yaratish
+    model - tashqi keshdan o'qilgan JSON qaysi pydantic modelga aylantirilishi
+    """
+    if not enabled:
+        cache = NullCache(name)
+    elif settings.CACHE_BACKEND == "memory":
+        cache = MemoryCache(name, max_size=max_size)
+    elif settings.CACHE_BACKEND == "redis":
+        cache = RedisCache.from_url(name, settings.CACHE_REDIS_URL, model=model)
+    else:
+        raise ValueError(f"Noma'lum kesh backend'i: {settings.CACHE_BACKEND}")
+
+    _caches[name] = cache
+    logger.debug(f"Kesh yaratildi: {name} ({type(cache).__name__})")
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Barcha keshlarning statistikasi"""
+    return {name: cache.stats() for name, cache in _caches.items()}
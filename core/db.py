@@ -4,27 +4,167 @@ Umumiy ustunlarga ega asosiy modellar
 Bazani ishga tushirish va ulanishni tekshirish
 """
 
-from datetime import datetime
-from sqlalchemy import Column, DateTime, String, func, text
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, List, Optional
+from sqlalchemy import Column, DateTime, Index, LargeBinary, String, event, func, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, declared_attr
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from sqlalchemy.sql.sqltypes import TypeDecorator, CHAR
 from sqlalchemy.dialects.postgresql import UUID
 from loguru import logger
+import itertools
+import os
+import time
 import uuid
 import asyncio
 
 from core.settings import settings
+from core.metrics import DB_POOL_WAIT, instrument_engine
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Ulanish olishni kutish vaqtini (db_pool_wait_seconds) yozuvchi pool
+    DB_POOL_SLOW_CHECKOUT dan uzoq kutilsa - pool kichikligi haqida ogohlantiradi
+    """
+
+    @property
+    def slow_checkout(self) -> float:
+        return settings.DB_POOL_SLOW_CHECKOUT
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            DB_POOL_WAIT.observe(waited)
+            if waited >= self.slow_checkout:
+                logger.warning(
+                    f"Pool'dan ulanish {waited:.3f} soniyada olindi "
+                    f"(band: {self.checkedout()}, hajm: {self.size()}, ortiqcha: {max(self.overflow(), 0)})"
+                )
+
+
+class SingleWriterPool(TimedQueuePool):
+    """
+    SQLITE_TUNED rejimidagi yagona yozuvchi ulanish pool'i
+    Bu yerda parallel yozuvlarning navbat kutishi odatiy hol - ogohlantirish
+    faqat SQLITE_WRITER_SLOW_CHECKOUT dan uzoq kutishda (kutish vaqti metrikada baribir bor)
+    """
+
+    @property
+    def slow_checkout(self) -> float:
+        return settings.SQLITE_WRITER_SLOW_CHECKOUT
+
+
+def engine_options(url: str, single_connection: bool = False) -> dict:
+    """
+    create_async_engine uchun pool va drayver sozlamalari (Settings'dan)
+    single_connection - pool'da bitta ulanish: yozuvchilar navbat bilan ishlaydi
+    """
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Ulanishdan oldin tekshiruv
+        "pool_recycle": settings.DB_POOL_RECYCLE,    # Ulanishni davriy yangilash
+    }
+
+    if ":memory:" in url:
+        # Xotiradagi SQLite bitta ulanishda yashaydi - unga navbatli pool to‘g‘ri kelmaydi
+        options["poolclass"] = StaticPool
+    else:
+        options.update(
+            poolclass=SingleWriterPool if single_connection else TimedQueuePool,
+            pool_size=1 if single_connection else settings.DB_POOL_SIZE,
+            max_overflow=0 if single_connection else settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_use_lifo=settings.DB_POOL_USE_LIFO,
+        )
+
+    if url.startswith("postgresql+asyncpg") and settings.DB_STATEMENT_CACHE_SIZE is not None:
+        # asyncpg keshi va SQLAlchemy adapterining prepared statement keshi
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    return options
+
+
+def sqlite_pragmas(query_only: bool = False) -> List[str]:
+    """SQLite ishlab chiqarish rejimi uchun har bir ulanishda bajariladigan PRAGMA'lar"""
+    pragmas = [
+        "PRAGMA journal_mode=WAL",  # O‘quvchilar yozuvchini kutmaydi
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",  # WAL'da NORMAL - har commit'da fsync yo‘q
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT}",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if query_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def apply_sqlite_pragmas(async_engine, query_only: bool = False) -> None:
+    """PRAGMA'larni engine'ning har bir yangi ulanishiga qo‘llash"""
+    pragmas = sqlite_pragmas(query_only)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+# SQLite ishlab chiqarish rejimi: bitta yozuvchi ulanish va alohida o‘quvchilar pool'i
+SQLITE_TUNED = (
+    settings.SQLITE_TUNED
+    and not settings.DB_USE_PGSQL
+    and ":memory:" not in settings.DATABASE_URL
+)
 
 # Ma'lumotlar bazasi dvigatelini yaratish
+# SQLITE_TUNED rejimida bu yagona yozuvchi: parallel yozuvlar "database is locked"
+# o‘rniga pool navbatida kutadi
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,  # DEBUG rejimida SQL so‘rovlarini chiqarish
     future=True,
-    pool_pre_ping=True,   # Ulanishdan oldin tekshiruv
-    pool_recycle=3600,    # Har bir soatdan keyin ulanishni yangilash
+    **engine_options(settings.DATABASE_URL, single_connection=SQLITE_TUNED),
 )
 
+# WAL rejimidagi o‘quvchilar (faqat o‘qish, yozuvchini bloklamaydi)
+sqlite_reader_engine = None
+if SQLITE_TUNED:
+    apply_sqlite_pragmas(engine)
+    sqlite_reader_engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        future=True,
+        **engine_options(settings.DATABASE_URL),
+    )
+    apply_sqlite_pragmas(sqlite_reader_engine, query_only=True)
+
+# O‘qish replikalari (DB_READ_REPLICA_URLS): sxema va ma'lumotlar tashqi
+# replikatsiya orqali yangilanadi, ilova ularga faqat o‘qish uchun murojaat qiladi
+replica_engines = [
+    create_async_engine(url, echo=settings.DEBUG, future=True, **engine_options(url))
+    for url in settings.DB_READ_REPLICA_URLS
+]
+_replica_cycle = itertools.cycle(replica_engines)
+
+# Yozuvdan keyin mijozni vaqtincha asosiy bazaga bog‘lovchi cookie (read-your-writes)
+REPLICA_STICKY_COOKIE = "db_primary"
+
+# So‘rov vaqti va pool holati metrikalari (/metrics)
+# Pool gauge'lari asosiy (yozuvchi) engine bo‘yicha, so‘rov vaqtlari hammasidan
+instrument_engine(engine)
+for _read_engine in [*replica_engines, sqlite_reader_engine]:
+    if _read_engine is not None:
+        instrument_engine(_read_engine, pool_metrics=False)
+
 # Sessiya fabrikasi
 SessionLocal = sessionmaker(
     engine,
@@ -38,34 +178,82 @@ Base = declarative_base()
 
 
 class GUID(TypeDecorator):
-    """UUID uchun maxsus ma'lumotlar turi"""
+    """
+    UUID uchun maxsus ma'lumotlar turi
+    PostgreSQL - mahalliy uuid turi, uuid.UUID obyektlari o‘zgarishsiz uzatiladi.
+    Boshqa bazalar - DB_UUID_STORAGE bo‘yicha: "char" - 32 belgili hex matn,
+    "binary" - 16 baytli BLOB (kalit va indekslar ikki baravar ixcham)
+    """
     impl = CHAR
     cache_ok = True
 
+    def __init__(self, binary: Optional[bool] = None):
+        super().__init__()
+        self.binary = settings.DB_UUID_STORAGE == "binary" if binary is None else binary
+
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
-            return dialect.type_descriptor(UUID())
+            return dialect.type_descriptor(UUID(as_uuid=True))
+        elif self.binary:
+            return dialect.type_descriptor(LargeBinary(16))
         else:
             return dialect.type_descriptor(CHAR(32))
 
     def process_bind_param(self, value, dialect):
         if value is None:
             return value
-        elif dialect.name == 'postgresql':
-            return str(value)
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        if dialect.name == 'postgresql':
+            return value
+        elif self.binary:
+            return value.bytes
         else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value)).replace('-', '')
-            else:
-                return str(value).replace('-', '')
+            return value.hex
 
     def process_result_value(self, value, dialect):
-        if value is None:
+        if value is None or isinstance(value, uuid.UUID):
             return value
+        elif isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
         else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
-            return value
+            return uuid.UUID(value)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Vaqt bo‘yicha tartiblangan UUIDv7 (RFC 9562): 48 bit millisekund vaqt + 74 bit tasodifiy
+    Yangi kalitlar B-tree indeksining oxiriga tushadi - qo‘shish joylashuvi yaxshilanadi
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # versiya: 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # variant: RFC 4122
+    return uuid.UUID(int=value)
+
+
+# Yangi yozuvlar uchun ID generatori (DB_UUID_VERSION)
+new_uuid = uuid7 if settings.DB_UUID_VERSION == 7 else uuid.uuid4
+
+
+def live_index_name(table_name: str, *columns: str) -> str:
+    """live_index nomi (masalan, statistikani shu indeks bo‘yicha o‘qish uchun)"""
+    return f"ix_{table_name}_live_{'_'.join(columns)}"
+
+
+def live_index(table_name: str, *columns: str) -> Index:
+    """deleted_at IS NULL shartli qisman indeks (PostgreSQL va SQLite)"""
+    live = text("deleted_at IS NULL")
+    return Index(
+        live_index_name(table_name, *columns),
+        *columns,
+        postgresql_where=live,
+        sqlite_where=live,
+    )
+
+
+def utcnow() -> datetime:
+    """Joriy vaqt (UTC, timezone bilan)"""
+    return datetime.now(timezone.utc)
 
 
 class BaseModel(Base):
@@ -75,14 +263,34 @@ class BaseModel(Base):
     """
     __abstract__ = True
 
-    id = Column(GUID(), primary_key=True, default=uuid.uuid4, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    id = Column(GUID(), primary_key=True, default=new_uuid)
+    # Vaqt ilova tomonida beriladi: kursor qiymatlari bazadagi qiymat bilan
+    # bir xil aniqlik va formatda solishtiriladi (SQLite'da ham)
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), onupdate=utcnow)
     deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete uchun
 
+    # Server tomonidagi standart qiymatlar (server_default) INSERT/UPDATE
+    # ichida RETURNING orqali olinadi - commit'dan keyin refresh shart emas
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Modelga xos qo‘shimcha "tirik" indekslar: ustunlar ro‘yxati,
+    # masalan [("category", "created_at", "id")]
+    __live_indexes__: List[tuple] = []
+
+    @declared_attr.directive
+    def __table_args__(cls):
+        # Faqat o‘chirilmagan yozuvlar bo‘yicha qisman (partial) indekslar:
+        # barcha so‘rovlar deleted_at IS NULL shartiga ega, o‘chirilganlar indeksga kirmaydi.
+        # Birinchisi keyset (kursor) sahifalash va sanash uchun
+        return tuple(
+            live_index(cls.__tablename__, *columns)
+            for columns in [("created_at", "id"), *cls.__live_indexes__]
+        )
+
     def soft_delete(self):
         """Yumshoq o‘chirish funksiyasi"""
-        self.deleted_at = datetime.utcnow()
+        self.deleted_at = utcnow()
 
     @property
     def is_deleted(self) -> bool:
@@ -91,6 +299,61 @@ class BaseModel(Base):
 
 
 
+async def release(db: AsyncSession) -> None:
+    """
+    Sessiya ulanishini darhol pool'ga qaytarish
+    Sessiya ulanishni birinchi so‘rovda oladi va yopilguncha ushlab turadi;
+    handler bazadagi ishini tugatgach chaqiriladi - javobni serializatsiya
+    qilish va yuborish paytida ulanish boshqa so‘rovlarga xizmat qiladi.
+    Keyingi so‘rov kerak bo‘lsa, sessiya yangi ulanish oladi
+    """
+    await db.close()
+
+
+def read_engine():
+    """
+    O‘qish uchun engine: replikalar navbat bilan (round-robin),
+    SQLITE_TUNED rejimida o‘quvchilar pool'i, bo‘lmasa asosiy baza
+    """
+    if replica_engines:
+        return next(_replica_cycle)
+    if sqlite_reader_engine is not None:
+        return sqlite_reader_engine
+    return engine
+
+
+def is_replica(bind) -> bool:
+    """
+    Engine o‘qish replikasimi (ma'lumotlari asosiy bazadan orqada qolishi mumkin)
+    Replikadan o‘qilgan qiymat keshga yozilmaydi: aks holda o‘chirilgan yoki eski
+    yozuv kesh TTL davomida qaytib keladi
+    """
+    return any(bind is replica for replica in replica_engines)
+
+
+async def gather_reads(
+    db: AsyncSession,
+    *reads: Callable[[AsyncSession], Awaitable[Any]]
+) -> List[Any]:
+    """
+    Bir-biriga bog‘liq bo‘lmagan o‘qish so‘rovlarini parallel bajarish
+    Har bir funksiya pool'dan alohida ulanish oladi (db bilan bir xil engine),
+    shuning uchun kechikish yig‘indi emas, eng sekin so‘rov bo‘yicha bo‘ladi.
+    Narxi: bitta so‘rov pool'dan bir vaqtda len(reads) ta ulanish band qiladi
+    (ro‘yxat sahifasi va total - ikkita), pool hajmi shunga qarab tanlanadi.
+    Engine'lar init_database da isitiladi (warm_read_engines) - sovuq engine'da
+    birinchi ulanishlar parallel ochilmaydi
+    """
+    if len(reads) < 2 or not settings.DB_PARALLEL_READS:
+        return [await read(db) for read in reads]
+
+    async def run(read):
+        async with SessionLocal(bind=db.bind) as session:
+            return await read(session)
+
+    return list(await asyncio.gather(*(run(read) for read in reads)))
+
+
 async def check_database_connection() -> bool:
     """Ma'lumotlar bazasiga ulanishni tekshirish"""
     try:
@@ -104,12 +367,88 @@ async def check_database_connection() -> bool:
         return False
 
 
+# Mavjud bazalarni yangilash funksiyalari (sync_conn bilan): modullar create_all
+# yaratmaydigan obyektlarni (masalan, SQLite FTS jadvallari) shu yerda qo‘shadi.
+# create_tables har ishga tushishda chaqiradi - funksiyalar qayta bajarilishga chidamli bo‘lishi kerak
+schema_upgrades: List[Callable[[Any], None]] = []
+
+
+def drop_superseded_indexes(sync_conn) -> None:
+    """
+    Oldingi versiyalardagi to‘liq indekslarni o‘chirish: ix_<jadval>_id birlamchi
+    kalitni takrorlardi, ix_<jadval>_created_at_id o‘rnini qisman live indeks egalladi.
+    Ular so‘rovlarda ishlatilmaydi, lekin har bir yozuvda yangilanadi
+    """
+    for table in Base.metadata.sorted_tables:
+        declared = {index.name for index in table.indexes}
+        for name in (f"ix_{table.name}_id", f"ix_{table.name}_created_at_id"):
+            if name not in declared:
+                sync_conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{name}"')
+
+
+schema_upgrades.append(drop_superseded_indexes)
+
+
+def create_missing_indexes(sync_conn) -> None:
+    """
+    Avvaldan mavjud jadvallarga modelda e'lon qilingan, lekin bazada yo‘q indekslarni qo‘shish
+    (create_all mavjud jadvallarning indekslariga tegmaydi)
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+async def migrate_guid_storage(to_binary: bool = True, batch_size: int = 1000) -> int:
+    """
+    SQLite'dagi mavjud GUID ustunlarini CHAR(32) hex <-> 16 baytli BLOB ko‘rinishiga o‘tkazish
+    Qiymatlar joyida, paketlab yangilanadi (indekslar ham yangilanadi); SQLite ustun
+    turini qat'iy tekshirmagani uchun jadvalni qayta yaratish shart emas.
+    Migratsiyadan keyin DB_UUID_STORAGE mos ravishda o‘zgartiriladi:
+        python -c "import asyncio; from core.db import migrate_guid_storage; asyncio.run(migrate_guid_storage())"
+    PostgreSQL allaqachon mahalliy uuid turida saqlaydi - o‘zgartirish talab qilinmaydi
+    """
+    if engine.dialect.name != "sqlite":
+        logger.info("GUID migratsiyasi faqat SQLite uchun kerak")
+        return 0
+
+    source_type = "text" if to_binary else "blob"
+    converted = 0
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if not isinstance(column.type, GUID):
+                continue
+            select_sql = (
+                f'SELECT rowid, "{column.name}" FROM "{table.name}" '
+                f'WHERE typeof("{column.name}") = ? LIMIT ?'
+            )
+            update_sql = f'UPDATE "{table.name}" SET "{column.name}" = ? WHERE rowid = ?'
+            while True:
+                async with engine.begin() as conn:
+                    rows = (await conn.exec_driver_sql(select_sql, (source_type, batch_size))).all()
+                    if not rows:
+                        break
+                    params = [
+                        (uuid.UUID(value).bytes if to_binary else uuid.UUID(bytes=value).hex, rowid)
+                        for rowid, value in rows
+                    ]
+                    await conn.exec_driver_sql(update_sql, params)
+                converted += len(rows)
+            logger.info(f"✓ {table.name}.{column.name}: GUID qiymatlari o‘tkazildi")
+
+    logger.info(f"✓ GUID migratsiyasi tugadi: {converted} ta qiymat")
+    return converted
+
+
 async def create_tables():
     """Barcha jadvallarni yaratish"""
     try:
         logger.info("Ma'lumotlar bazasi jadvallari yaratilmoqda...")
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_missing_indexes)
+            for upgrade in schema_upgrades:
+                await conn.run_sync(upgrade)
         logger.info("✓ Barcha jadvallar muvaffaqiyatli yaratildi")
         return True
     except Exception as e:
@@ -130,6 +469,24 @@ async def drop_tables():
         return False
 
 
+async def warm_read_engines() -> None:
+    """
+    O‘qish engine'larida (SQLITE_TUNED o‘quvchilari, replikalar) bitta ulanishni
+    ochib pool'ga qaytarish. Dialektning birinchi ulanishdagi sozlanishi shu yerda,
+    so‘rovlar kelishidan oldin bajariladi: gather_reads sovuq engine'da ikki
+    ulanishni bir vaqtda ochganda birinchi ulanish qulfida osilib qolmaydi
+    """
+    for read_engine in [sqlite_reader_engine, *replica_engines]:
+        if read_engine is None:
+            continue
+        try:
+            async with read_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            # Replika vaqtincha ishlamasa ilova baribir ishga tushadi
+            logger.warning(f"O‘qish bazasiga ulanib bo‘lmadi ({read_engine.url.render_as_string()}): {e}")
+
+
 async def init_database():
     """Ma'lumotlar bazasini boshlang‘ich sozlash va tekshirish"""
     logger.info("Ma'lumotlar bazasini boshlang‘ich sozlash...")
@@ -142,6 +499,8 @@ async def init_database():
         logger.error("Ma'lumotlar bazasi jadvallarini yaratib bo‘lmadi.")
         return False
 
+    await warm_read_engines()
+
     logger.info("✓ Ma'lumotlar bazasi muvaffaqiyatli sozlandi")
     return True
 
@@ -150,6 +509,10 @@ async def close_database():
     """Ma'lumotlar bazasi bilan bog‘lanishni yopish"""
     try:
         await engine.dispose()
+        for replica in replica_engines:
+            await replica.dispose()
+        if sqlite_reader_engine is not None:
+            await sqlite_reader_engine.dispose()
         logger.info("✓ Ma'lumotlar bazasi bilan barcha ulanishlar yopildi")
     except Exception as e:
         logger.error(f"✗ Ma'lumotlar bazasini yopishda xatolik: {e}")
\ No newline at end of file
@@ -3,25 +3,57 @@ Ilovaning umumiy bog‘liqliklari
 FastAPI da Dependency Injection orqali ishlatiladi
 """
 
-from typing import AsyncGenerator
-from fastapi import HTTPException, Depends, status
+import inspect
+from typing import AsyncGenerator, Callable, Optional, Type, TypeVar
+from fastapi import HTTPException, Depends, Header, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from loguru import logger
 
 from core.settings import settings
-from core.db import SessionLocal
+from core.db import REPLICA_STICKY_COOKIE, SessionLocal, engine, read_engine
+from shared.schemas.common import ConditionalHeaders
 
 # Bearer xavfsizlik sxemasi
 security = HTTPBearer()
 
+M = TypeVar("M", bound=BaseModel)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Ma'lumotlar bazasi sessiyasini olish
-    Foydalanishdan keyin avtomatik yopiladi
+    Ulanish pool'dan faqat birinchi so‘rovda olinadi (validatsiyadan o‘tmagan
+    yoki keshdan javob bergan handler ulanish band qilmaydi).
+    Handler core.db.release() bilan ulanishni oldinroq qaytarishi mumkin,
+    aks holda foydalanishdan keyin avtomatik yopiladi
+    """
+    async for session in _session(engine):
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Faqat o‘qish uchun sessiya (replika, round-robin)
+    Yaqinda yozgan mijoz (sticky cookie) o‘z yozuvlarini ko‘rishi uchun
+    asosiy bazadan o‘qiydi
     """
-    async with SessionLocal() as session:
+    async for session in _session(get_read_engine(request)):
+        yield session
+
+
+def get_read_engine(request: Request) -> AsyncEngine:
+    """
+    O‘qish uchun engine (sessiyani o‘zi ochadigan oqimli handlerlar uchun)
+    Yaqinda yozgan mijoz (sticky cookie) uchun asosiy baza
+    """
+    return engine if REPLICA_STICKY_COOKIE in request.cookies else read_engine()
+
+
+async def _session(bind) -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal(bind=bind) as session:
         try:
             yield session
         except Exception as e:
@@ -32,6 +64,39 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_conditional_headers(
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+) -> ConditionalHeaders:
+    """
+    Shartli so‘rov sarlavhalarini olish
+    Servislar ular asosida 304 Not Modified qaytarishi mumkin
+    """
+    return ConditionalHeaders(
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
+    )
+
+
+def query_model(model: Type[M]) -> Callable[..., M]:
+    """
+    Pydantic modelni query parametrlar dependency'siga aylantirish
+    Depends(Model) dan farqi: cheklovlar (ge, le, validatorlar) buzilsa
+    500 emas, FastAPI'ning odatiy 422 javobi qaytariladi
+    """
+    def dependency(**params) -> M:
+        try:
+            return model(**params)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("query", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+
+    # FastAPI parametrlarni (va OpenAPI hujjatini) model maydonlaridan oladi
+    dependency.__signature__ = inspect.signature(model)
+    return dependency
+
+
 async def verify_bearer_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> str:
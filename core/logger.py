@@ -1,43 +1,111 @@
 """
 Loglash (log yuritish)ni loguru orqali sozlash
 Bir marta shu yerda sozlanadi, keyinchalik logger ni istalgan joyda chaqirish mumkin
+LOG_ASYNC yoqilganda yozuvlar chegaralangan navbat orqali alohida oqimda yoziladi
 """
 
+import atexit
+import copy
+import queue
 import sys
+import threading
 from pathlib import Path
+from typing import Optional
 from loguru import logger
 
 from core.settings import settings
 
+# Record maydonlari - fon oqimida asl joylashuv bilan qayta chiqarish uchun
+_RECORD_FIELDS = (
+    "elapsed", "exception", "extra", "file", "function", "line",
+    "module", "name", "process", "thread", "time",
+)
 
-def setup_logging():
-    """Ilova uchun loglashni sozlash"""
-    
-    # Standart handlerni olib tashlaymiz
-    logger.remove()
-    
-    # Agar loglar uchun papka mavjud bo‘lmasa — yaratamiz
-    log_dir = Path(settings.LOG_FILE).parent
-    log_dir.mkdir(exist_ok=True)
-    
-    # Log yozuvi formati
-    log_format = (
-        "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-        "<level>{level: <8}</level> | "
-        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-        "<level>{message}</level>"
-    )
-    
+# Log yozuvi formati
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<magenta>{extra[request_id]}</magenta> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "<level>{message}</level>"
+)
+
+# Navbatli sink va uning handler ID si (LOG_ASYNC rejimida)
+_queued_sink: Optional["QueuedSink"] = None
+_queued_handler_id: Optional[int] = None
+
+
+class QueuedSink:
+    """
+    Chegaralangan navbatli sink
+    Event loop oqimi faqat yozuvni navbatga qo'yadi; formatlash, fayl I/O,
+    rotatsiya va siqish alohida oqimda haqiqiy sink'lar orqali bajariladi.
+    Navbat to'lganda: "drop" - yozuv tashlab yuboriladi va sanaladi,
+    "block" - joy bo'shaguncha kutiladi (backpressure)
+    """
+
+    def __init__(self, target, maxsize: int = 10000, policy: str = "drop"):
+        self.target = target
+        self.policy = policy
+        self.dropped = 0
+        self._reported = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._worker, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message) -> None:
+        try:
+            if self.policy == "block":
+                self._queue.put(message.record)
+            else:
+                self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _emit(self, record) -> None:
+        fields = {key: record[key] for key in _RECORD_FIELDS}
+        self.target.patch(lambda r: r.update(fields)).log(record["level"].name, record["message"])
+
+    def _worker(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            self._emit(record)
+            if self.dropped != self._reported and self._queue.empty():
+                self.target.warning(f"Log navbati to'lgan: {self.dropped - self._reported} ta yozuv tashlab yuborildi")
+                self._reported = self.dropped
+
+    def stop(self) -> None:
+        """Navbatdagi barcha yozuvlarni yozib, oqimni to'xtatish"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            self.target.complete()
+
+
+def _is_access(record) -> bool:
+    """Strukturali access log yozuvi (middleware'da bind(access=True))"""
+    return "access" in record["extra"]
+
+
+def _not_access(record) -> bool:
+    return "access" not in record["extra"]
+
+
+def _add_sinks(target, log_format: str) -> None:
+    """Konsol, umumiy va xatoliklar fayli sink'larini qo'shish"""
     # Konsolga chiqarish
-    logger.add(
+    target.add(
         sys.stdout,
         format=log_format,
         level="DEBUG" if settings.DEBUG else settings.LOG_LEVEL,
         colorize=True,
+        filter=_not_access,
     )
-    
+
     # Umumiy log fayliga yozish
-    logger.add(
+    target.add(
         settings.LOG_FILE,
         format=log_format,
         rotation="10 MB",        # Har 10 MB dan keyin yangi fayl
@@ -45,10 +113,11 @@ def setup_logging():
         compression="zip",       # Eski loglar zip holatda saqlanadi
         level=settings.LOG_LEVEL,
         encoding="utf-8",
+        filter=_not_access,
     )
-    
+
     # Faqat xatoliklar uchun alohida log fayl
-    logger.add(
+    target.add(
         settings.LOG_FILE.replace(".log", "_errors.log"),
         format=log_format,
         level="ERROR",
@@ -56,6 +125,87 @@ def setup_logging():
         retention="30 days",
         compression="zip",
         encoding="utf-8",
+        filter=_not_access,
+    )
+
+    # Strukturali access log: har bir so‘rovga bitta JSON qator
+    if settings.ACCESS_LOG_FORMAT == "json":
+        target.add(
+            settings.ACCESS_LOG_FILE,
+            format="{message}",
+            level="DEBUG",
+            rotation="100 MB",
+            retention="7 days",
+            compression="zip",
+            encoding="utf-8",
+            filter=_is_access,
+        )
+
+
+def _detach_queue() -> bool:
+    """
+    Navbatli sink'ni logger'dan olib, oqimini to'xtatish
+    Avval handler olinadi - keyingi yozuvlar to'xtagan navbatga tushmaydi
+    (block rejimida chaqiruvchi abadiy kutib qolardi)
+    """
+    global _queued_sink, _queued_handler_id
+    if _queued_sink is None:
+        return False
+    try:
+        logger.remove(_queued_handler_id)
+    except ValueError:
+        pass  # logger.remove() bilan allaqachon olingan
+    _queued_sink.stop()
+    _queued_sink = None
+    _queued_handler_id = None
+    return True
+
+
+def setup_logging():
+    """Ilova uchun loglashni sozlash"""
+    global _queued_sink, _queued_handler_id
+
+    # Qayta chaqirilganda eski navbat oqimi to'xtatiladi
+    _detach_queue()
+    # Standart handlerni olib tashlaymiz
+    logger.remove()
+
+    # Agar loglar uchun papka mavjud bo‘lmasa — yaratamiz
+    log_dir = Path(settings.LOG_FILE).parent
+    log_dir.mkdir(exist_ok=True)
+    Path(settings.ACCESS_LOG_FILE).parent.mkdir(exist_ok=True)
+
+    # So‘rovdan tashqaridagi yozuvlar uchun standart request_id
+    logger.configure(extra={"request_id": "-"})
+
+    if settings.LOG_ASYNC:
+        # Haqiqiy sink'lar alohida logger nusxasida, asosiy logger'da faqat navbat
+        backend = copy.deepcopy(logger)
+        _add_sinks(backend, LOG_FORMAT)
+        _queued_sink = QueuedSink(
+            backend,
+            maxsize=settings.LOG_QUEUE_SIZE,
+            policy=settings.LOG_QUEUE_POLICY,
+        )
+        _queued_handler_id = logger.add(
+            _queued_sink,
+            format="{message}",
+            level="DEBUG" if settings.DEBUG else settings.LOG_LEVEL,
+        )
+        atexit.register(_queued_sink.stop)
+    else:
+        _add_sinks(logger, LOG_FORMAT)
+
+    logger.info(
+        f"Loglash sozlandi. Debug rejimi: {settings.DEBUG}, Daraja: {settings.LOG_LEVEL}, "
+        f"Navbatli: {settings.LOG_ASYNC}"
     )
-    
-    logger.info(f"Loglash sozlandi. Debug rejimi: {settings.DEBUG}, Daraja: {settings.LOG_LEVEL}")
+
+
+def shutdown_logging():
+    """
+    Navbatli rejimda qolgan yozuvlarni yozib tugatish
+    Shundan keyingi yozuvlar to'g'ridan-to'g'ri (navbatsiz) sink'larga yoziladi
+    """
+    if _detach_queue():
+        _add_sinks(logger, LOG_FORMAT)
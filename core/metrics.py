@@ -0,0 +1,276 @@
+"""
+Prometheus formatidagi metrikalar (hisoblagich, gauge va gistogramma)
+Qiymatlar event loop oqimida oddiy dict/list amallari bilan yoziladi -
+qulf (lock) ishlatilmaydi, yozish narxi bir necha dict murojaatiga teng.
+Matn formati faqat /metrics so'ralganda yig'iladi
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+
+# HTTP so'rovlar uchun gistogramma chegaralari (sekund)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Ma'lumotlar bazasi so'rovlari va pool kutish vaqti uchun mayda chegaralar
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Barcha metrikalar uchun asosiy klass"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    """Faqat o'suvchi hisoblagich"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """
+    Oshishi va kamayishi mumkin bo'lgan qiymat
+    function berilsa, qiymat har safar /metrics so'ralganda o'qiladi
+    (masalan, pool holati) - so'rov yo'lida hech narsa yozilmaydi
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+        self.function = function
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._values[labels] = value
+
+    def samples(self) -> Iterable[str]:
+        if self.function is not None:
+            yield f"{self.name} {_format_value(self.function())}"
+            return
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """
+    Gistogramma: har bir yozuv bitta bisect va ikkita qo'shish
+    Bo'laklar kumulyativ emas saqlanadi, kumulyativ qiymat render paytida hisoblanadi
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bo'laklar..., +Inf, sum, count]
+        self._values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def samples(self) -> Iterable[str]:
+        bounds = (*self.buckets, float("inf"))
+        for labels, state in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            suffix = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{suffix} {_format_value(state[-2])}"
+            yield f"{self.name}_count{suffix} {state[-1]}"
+
+
+class Registry:
+    """Metrikalar ro'yxati va matn formatiga o'tkazish"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# HTTP
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total",
+    "HTTP so'rovlar soni",
+    ("method", "route", "status"),
+))
+HTTP_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP so'rovni qayta ishlash vaqti",
+    ("method", "route", "status"),
+))
+HTTP_IN_PROGRESS = registry.register(Gauge(
+    "http_requests_in_progress",
+    "Hozir qayta ishlanayotgan so'rovlar",
+    ("method",),
+))
+
+# Ma'lumotlar bazasi
+DB_QUERY_DURATION = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "SQL so'rovlarni bajarish vaqti",
+    ("operation",),
+    buckets=DB_BUCKETS,
+))
+DB_POOL_WAIT = registry.register(Histogram(
+    "db_pool_wait_seconds",
+    "Pool'dan ulanish olishni kutish vaqti",
+    buckets=DB_BUCKETS,
+))
+DB_CONNECTION_HOLD = registry.register(Histogram(
+    "db_connection_hold_seconds",
+    "Ulanish pool'dan olingandan qaytarilgunicha o'tgan vaqt",
+    buckets=DB_BUCKETS,
+))
+
+
+def _operation(statement: str) -> str:
+    """SQL so'rov turi (SELECT, INSERT, ...) - label qiymatlari soni cheklangan"""
+    head = statement[:32].split(None, 1)
+    return head[0].upper() if head else "UNKNOWN"
+
+
+def instrument_engine(engine, pool_metrics: bool = True) -> None:
+    """
+    Engine'ga so'rov vaqti, ulanishni ushlab turish vaqti hodisalarini
+    va pool holati gauge'larini ulash
+    Kutish vaqti pool klassining o'zida yoziladi (core.db.TimedQueuePool).
+    pool_metrics=False - qo'shimcha engine'lar (replikalar) uchun: pool gauge'lari
+    faqat asosiy engine bo'yicha ro'yxatga olinadi
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if starts:
+            DB_QUERY_DURATION.observe(time.perf_counter() - starts.pop(), (_operation(statement),))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        # Xato bilan tugagan so'rovda after_cursor_execute chaqirilmaydi - boshlanish
+        # vaqti olib tashlanmasa, ro'yxat o'sadi va keyingi so'rovlar vaqti siljiydi
+        connection = context.connection
+        starts = connection.info.get("query_start") if connection is not None else None
+        if starts:
+            starts.pop()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checkout_at = connection_record.info.pop("checkout_at", None)
+        if checkout_at is not None:
+            DB_CONNECTION_HOLD.observe(time.perf_counter() - checkout_at)
+
+    if not pool_metrics:
+        return
+
+    def pool_stat(name: str) -> Callable[[], float]:
+        # engine.dispose() pool'ni almashtiradi - har safar joriy pool o'qiladi
+        def read() -> float:
+            method = getattr(sync_engine.pool, name, None)
+            # QueuePool.overflow() ishlatilmagan sig'imni manfiy son bilan qaytaradi
+            return max(method(), 0) if method is not None else 0
+        return read
+
+    for name, documentation in (
+        ("size", "Pool hajmi"),
+        ("checkedout", "Band ulanishlar"),
+        ("checkedin", "Pool'dagi bo'sh ulanishlar"),
+        ("overflow", "Pool hajmidan ortiq ochilgan ulanishlar"),
+    ):
+        registry.register(Gauge(f"db_pool_{name}", documentation, function=pool_stat(name)))
+
+
+def render_metrics() -> str:
+    """Barcha metrikalar Prometheus matn formatida"""
+    return registry.render()
@@ -0,0 +1,133 @@
+"""
+Sahifalangan ro'yxatlar uchun umumiy sonni hisoblash strategiyalari
+Aniq (COUNT), TTL keshlangan va rejalashtiruvchi statistikasidan taxminiy son
+"""
+
+from typing import Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from loguru import logger
+
+from core.cache import MISSING, MemoryCache
+from core.db import live_index_name
+from core.settings import settings
+
+
+class CountStrategy:
+    """Umumiy sonni hisoblash strategiyasi uchun asosiy klass"""
+
+    async def count(
+        self, db: AsyncSession, query: Select, table_name: str, filtered: bool = False
+    ) -> int:
+        """
+        COUNT so'rovi bo'yicha elementlar sonini qaytarish
+        filtered=True - so'rovda foydalanuvchi filtrlari bor (jadval statistikasi yaramaydi)
+        """
+        raise NotImplementedError
+
+    def invalidate(self, table_name: str) -> None:
+        """Jadval o'zgarganda saqlangan natijalarni bekor qilish"""
+
+
+class ExactCount(CountStrategy):
+    """Har safar COUNT so'rovini bajaradi"""
+
+    async def count(
+        self, db: AsyncSession, query: Select, table_name: str, filtered: bool = False
+    ) -> int:
+        result = await db.execute(query)
+        return result.scalar()
+
+
+class CachedCount(ExactCount):
+    """
+    COUNT natijasini TTL davomida saqlaydi
+    Kalit - so'rov matni va parametrlari, shuning uchun turli filtrlar aralashmaydi.
+    Natijalar chegaralangan LRU+TTL keshda (filtr qiymatlari cheksiz xilma-xil bo'lishi mumkin).
+    invalidate() jadval avlodini (generation) oshiradi - eski kalitlar boshqa
+    o'qilmaydi va LRU bo'yicha chiqarib yuboriladi
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1000):
+        self.ttl = ttl
+        self._cache = MemoryCache("count", max_size=max_size)
+        self._generations: Dict[str, int] = {}
+
+    def _key(self, query: Select, table_name: str) -> str:
+        compiled = query.compile()
+        generation = self._generations.get(table_name, 0)
+        return f"{table_name}:{generation}:{compiled}|{sorted(compiled.params.items())!r}"
+
+    async def count(
+        self, db: AsyncSession, query: Select, table_name: str, filtered: bool = False
+    ) -> int:
+        key = self._key(query, table_name)
+        cached = await self._cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        total = await super().count(db, query, table_name)
+        await self._cache.set(key, total, self.ttl)
+        return total
+
+    def invalidate(self, table_name: str) -> None:
+        self._generations[table_name] = self._generations.get(table_name, 0) + 1
+
+
+class EstimatedCount(ExactCount):
+    """
+    Rejalashtiruvchi statistikasidan taxminiy son
+    PostgreSQL: pg_class.reltuples, SQLite: sqlite_stat1 (ANALYZE dan keyin)
+    Statistika butun jadval bo'yicha: filtrlangan so'rov (filtered=True) yoki
+    statistika yo'q bo'lsa aniq COUNT ga qaytadi
+    """
+
+    async def _estimate(self, db: AsyncSession, table_name: str) -> Optional[int]:
+        dialect = db.bind.dialect.name
+        try:
+            if dialect == "postgresql":
+                result = await db.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+                    {"t": table_name},
+                )
+                estimate = result.scalar()
+                return estimate if estimate is not None and estimate >= 0 else None
+
+            if dialect == "sqlite":
+                # Qisman (created_at, id) indeksining birinchi soni - o'chirilmagan qatorlar
+                result = await db.execute(
+                    text("SELECT stat FROM sqlite_stat1 WHERE tbl = :t AND idx = :i"),
+                    {"t": table_name, "i": live_index_name(table_name, "created_at", "id")},
+                )
+                stat = result.scalar()
+                return int(stat.split()[0]) if stat else None
+        except DBAPIError as e:
+            logger.debug(f"{table_name} uchun statistika topilmadi: {e}")
+        return None
+
+    async def count(
+        self, db: AsyncSession, query: Select, table_name: str, filtered: bool = False
+    ) -> int:
+        if filtered:
+            return await super().count(db, query, table_name)
+        estimate = await self._estimate(db, table_name)
+        if estimate is None:
+            return await super().count(db, query, table_name)
+        return estimate
+
+
+def get_count_strategy(name: Optional[str] = None) -> CountStrategy:
+    """Sozlamalardagi nom bo'yicha strategiyani yaratish"""
+    name = (name or settings.PAGINATION_COUNT_STRATEGY).lower()
+    if name == "exact":
+        return ExactCount()
+    if name == "cached":
+        return CachedCount(
+            settings.PAGINATION_COUNT_CACHE_TTL,
+            max_size=settings.PAGINATION_COUNT_CACHE_MAX_SIZE,
+        )
+    if name == "estimated":
+        return EstimatedCount()
+    raise ValueError(f"Noma'lum hisoblash strategiyasi: {name}")
@@ -21,18 +21,102 @@ class Settings(BaseSettings):
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "postgres"
 
+    # Mustaqil o‘qish so‘rovlarini alohida ulanishlarda parallel bajarish
+    DB_PARALLEL_READS: bool = True
+
+    # UUID kalitlar: saqlash usuli (SQLite uchun char - hex matn, binary - 16 bayt)
+    # va yangi ID versiyasi (7 - vaqt bo‘yicha tartiblangan, 4 - tasodifiy)
+    DB_UUID_STORAGE: str = "char"
+    DB_UUID_VERSION: int = 7
+
+    # Ulanishlar pool'i
+    DB_POOL_SIZE: int = 5               # Doimiy ochiq ulanishlar soni
+    DB_MAX_OVERFLOW: int = 10           # Yuklama oshganda qo‘shimcha ochiladigan ulanishlar
+    DB_POOL_TIMEOUT: float = 30.0       # Bo‘sh ulanishni kutish chegarasi, sekundlarda
+    DB_POOL_PRE_PING: bool = True       # Har bir olishda tekshiruv (qo‘shimcha so‘rov-javob)
+    DB_POOL_RECYCLE: int = 3600         # Ulanishni yangilash davri, sekundlarda (-1 - hech qachon)
+    DB_POOL_USE_LIFO: bool = False      # Oxirgi qaytarilgan ulanishni birinchi berish
+    DB_POOL_SLOW_CHECKOUT: float = 0.1  # Bundan uzoq kutilsa ogohlantirish yoziladi, sekundlarda
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None  # asyncpg prepared statement keshi (pgbouncer uchun 0)
+
+    # O‘qish replikalari: GET so‘rovlari navbat bilan replikalarga yuboriladi
+    DB_READ_REPLICA_URLS: List[str] = []
+    DB_REPLICA_STICKY_SECONDS: int = 5  # Yozuvdan keyin mijoz shuncha vaqt asosiy bazadan o‘qiydi
+
     # SQLite sozlamalari
     SQLITE_DB_PATH: str = "sqlite3.db"  # Baza faylining yo‘li
+    # Ishlab chiqarish rejimi: WAL, PRAGMA'lar, bitta yozuvchi ulanish va o‘quvchilar pool'i
+    SQLITE_TUNED: bool = False
+    SQLITE_SYNCHRONOUS: str = "NORMAL"    # WAL bilan NORMAL - commit'da fsync yo‘q, buzilish xavfi yo‘q
+    SQLITE_BUSY_TIMEOUT: int = 5000       # Qulf bo‘shashini kutish, millisekundlarda
+    SQLITE_CACHE_SIZE: int = -64000       # Manfiy qiymat - KiB (64 MB)
+    SQLITE_MMAP_SIZE: int = 268435456     # Xotiraga akslantirilgan o‘qish (256 MB)
+    SQLITE_WRITER_SLOW_CHECKOUT: float = 1.0  # Yagona yozuvchini kutish ogohlantirishi chegarasi, sekundlarda
+
+    # Sahifalash: umumiy sonni hisoblash usuli (exact, cached, estimated)
+    PAGINATION_COUNT_STRATEGY: str = "exact"
+    PAGINATION_COUNT_CACHE_TTL: float = 30.0  # cached uchun, sekundlarda
+    PAGINATION_COUNT_CACHE_MAX_SIZE: int = 1000  # cached uchun saqlanadigan so'rovlar soni
+
+    # Echo: ommaviy yaratish (POST /api/echo/bulk)
+    ECHO_BULK_MAX_ITEMS: int = 1000      # Bitta so‘rovdagi maksimal elementlar soni
+    ECHO_BULK_BATCH_SIZE: int = 500      # Bitta ko‘p qatorli INSERT dagi qatorlar soni
+
+    # Echo: xabarlarni qayta ishlash zanjiri (modules.echo.funcs.PROCESSORS nomlari)
+    ECHO_PROCESSORS: List[str] = ["reverse"]
+    ECHO_PROCESSOR_WORKERS: int = 0               # > 0 - og‘ir (cpu_bound) zanjir alohida jarayonlarda
+    ECHO_PROCESSOR_OFFLOAD_MIN_BATCH: int = 64    # Bundan kichik paketlar joyida qayta ishlanadi
+
+    # Echo: eksport (GET /api/echo/export) - keyset bo‘yicha bo‘laklab o‘qish
+    ECHO_EXPORT_BATCH_SIZE: int = 1000   # Bitta so‘rovda o‘qiladigan qatorlar (ulanish faqat shu vaqtga olinadi)
+
+    # Echo: NDJSON import (POST /api/echo/import va modules.echo.cli)
+    ECHO_IMPORT_CHUNK_SIZE: int = 1000       # Bitta COPY / executemany dagi qatorlar (bitta commit)
+    ECHO_IMPORT_MAX_ERRORS: int = 100        # Javobda qaytariladigan qator xatolari (qolganlari faqat sanaladi)
+    ECHO_IMPORT_MAX_LINE_BYTES: int = 65536  # Bundan uzun qator o‘qilmaydi va xato deb hisoblanadi
+
+    # Echo: alohida POST so‘rovlarini mikro-paketlab yozish (ixtiyoriy)
+    ECHO_WRITE_BATCHING: bool = False
+    ECHO_WRITE_BATCH_MAX_SIZE: int = 100     # Paketdagi maksimal yozuvlar soni
+    ECHO_WRITE_BATCH_MAX_DELAY: float = 0.005  # Paket yig‘ish oynasi, sekundlarda
+    ECHO_WRITE_BATCH_MAX_QUEUE: int = 1000     # Navbat to‘lsa yozuv navbatsiz, alohida bajariladi
+
+    # Kesh
+    CACHE_BACKEND: str = "memory"                   # memory yoki redis
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    ECHO_CACHE_ENABLED: bool = True
+    ECHO_CACHE_MAX_SIZE: int = 10000               # Jarayon ichidagi keshdagi maksimal yozuvlar
+    ECHO_CACHE_TTL: float = 300.0                  # Topilgan echo uchun, sekundlarda
+    ECHO_CACHE_NEGATIVE_TTL: float = 5.0           # Topilmagan (404) javoblar uchun
 
     # Xavfsizlik
     BEARER_TOKEN: str = "ishlab-chiqarishda-almashtiring"
+    CURSOR_SECRET: str = "ishlab-chiqarishda-almashtiring"  # Sahifalash kursorlarini imzolash kaliti
 
     # CORS (ruxsat etilgan manbalar)
     ALLOWED_ORIGINS: List[str] = ["*"]
 
+    # Javoblarni siqish (gzip/deflate, o‘rnatilgan bo‘lsa brotli/zstd)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 500             # Bundan kichik javoblar siqilmaydi (bayt)
+    COMPRESSION_GZIP_LEVEL: int = 6             # gzip/deflate darajasi (1-9)
+    COMPRESSION_BROTLI_QUALITY: int = 4         # brotli sifati (0-11)
+    COMPRESSION_ZSTD_LEVEL: int = 3             # zstd darajasi (1-22)
+    COMPRESSION_OFFLOAD_SIZE: int = 262144      # Bundan katta tanalar alohida oqimda siqiladi
+
     # Loglash
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/app.log"
+    LOG_ASYNC: bool = False              # Yozuvlarni navbat orqali alohida oqimda yozish
+    LOG_QUEUE_SIZE: int = 10000          # Navbat hajmi (LOG_ASYNC uchun)
+    LOG_QUEUE_POLICY: str = "drop"       # Navbat to‘lganda: drop yoki block
+    ACCESS_LOG_LEVEL: str = "INFO"       # Bundan past darajadagi so‘rov loglari yozilmaydi
+    ACCESS_LOG_FORMAT: str = "text"      # text yoki json (har bir so‘rovga bitta JSON qator)
+    ACCESS_LOG_FILE: str = "logs/access.log"  # json rejimidagi access log fayli
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # 4xx/5xx dan boshqa javoblarning qancha qismi loglanadi
+
+    # Metrikalar (Prometheus formatida /metrics)
+    METRICS_ENABLED: bool = True
 
     @computed_field
     @property
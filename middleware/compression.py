@@ -0,0 +1,241 @@
+"""
+Javoblarni siqish uchun middleware (gzip, deflate, brotli va zstd - o'rnatilgan bo'lsa)
+Kichik javoblar siqilmaydi, oqimli (streaming) javoblar bo'lakma-bo'lak siqiladi,
+katta javoblar esa event loop'ni bloklamaslik uchun alohida oqimda siqiladi
+"""
+
+import asyncio
+import zlib
+from typing import Callable, Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli ixtiyoriy
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard ixtiyoriy
+    zstandard = None
+
+# Siqishga arziydigan kontent turlari
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class _Encoder:
+    """Oqimli siqish uchun umumiy interfeys: compress/flush/finish"""
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def flush(self) -> bytes:
+        """Hozirgacha berilgan ma'lumotni mijozga yuborish mumkin bo'lgan holga keltirish"""
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+
+class _ZlibEncoder(_Encoder):
+    def __init__(self, level: int, wbits: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder(_Encoder):
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdEncoder(_Encoder):
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding bo'yicha javobni siqadigan ASGI middleware
+    Tanlash tartibi: zstd, br, gzip, deflate (mavjud va mijoz qabul qilganlari)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        offload_size: int = 256 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+        self.encoders: Dict[str, Callable[[], _Encoder]] = {}
+        if zstandard is not None:
+            self.encoders["zstd"] = lambda: _ZstdEncoder(zstd_level)
+        if brotli is not None:
+            self.encoders["br"] = lambda: _BrotliEncoder(brotli_quality)
+        self.encoders["gzip"] = lambda: _ZlibEncoder(gzip_level, 16 + zlib.MAX_WBITS)
+        self.encoders["deflate"] = lambda: _ZlibEncoder(gzip_level, zlib.MAX_WBITS)
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Mijoz qabul qiladigan (q > 0) eng ma'qul kodlashni tanlash"""
+        accepted = set()
+        for part in accept_encoding.lower().split(","):
+            name, _, params = part.strip().partition(";")
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) <= 0:
+                        continue
+                except ValueError:
+                    continue
+            accepted.add(name.strip())
+        for name in self.encoders:
+            if name in accepted or "*" in accepted:
+                return name
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """
+    Bitta javob uchun holat: boshlang'ich xabarni ushlab turadi va tanani siqadi
+    Oqimli javobning birinchi bo'laklari minimum_size ga yetguncha yig'iladi -
+    shunda kichik javoblar bo'laklarga bo'lingan bo'lsa ham siqilmaydi
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+        self.pending = b""
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+    def _compress_all(self, body: bytes) -> bytes:
+        encoder = self.middleware.encoders[self.encoding]()
+        return encoder.compress(body) + encoder.finish()
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Sarlavhalar siqish haqida qaror qabul qilingach yuboriladi
+            self.start_message = message
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        if self.encoder is not None:
+            await self._send_chunk(message.get("body", b""), message.get("more_body", False))
+            return
+
+        start = self.start_message
+        headers = MutableHeaders(raw=start["headers"])
+        if not self._compressible(headers):
+            self.passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        self.pending += message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if more_body and len(self.pending) < self.middleware.minimum_size:
+            return
+
+        body, self.pending = self.pending, b""
+        if not more_body:
+            # Butun tana ma'lum - kichik bo'lsa o'zgarishsiz yuboriladi
+            if len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            if len(body) >= self.middleware.offload_size:
+                compressed = await asyncio.to_thread(self._compress_all, body)
+            else:
+                compressed = self._compress_all(body)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        # Oqimli javob: uzunlik oldindan ma'lum emas
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        del headers["Content-Length"]
+        self.encoder = self.middleware.encoders[self.encoding]()
+        await self._send(start)
+        await self._send_chunk(body, more_body)
+
+    async def _send_chunk(self, body: bytes, more_body: bool) -> None:
+        def encode() -> bytes:
+            data = self.encoder.compress(body)
+            return data + (self.encoder.flush() if more_body else self.encoder.finish())
+
+        # Katta bo'laklar event loop'dan tashqarida siqiladi (zlib GIL'ni bo'shatadi)
+        if len(body) >= self.middleware.offload_size:
+            data = await asyncio.to_thread(encode)
+        else:
+            data = encode()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -13,5 +13,5 @@ def get_cors_middleware():
         allow_credentials=True,  # Cookie va header orqali autentifikatsiyani qo‘llab-quvvatlaydi
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],  # Ruxsat berilgan HTTP metodlar
         allow_headers=["*"],  # Har qanday header'ga ruxsat
-        expose_headers=["X-Process-Time", "X-Request-ID"],  # Javobda ko‘rsatiladigan maxsus headerlar
+        expose_headers=["X-Process-Time", "X-Request-ID", "ETag", "Last-Modified"],  # Javobda ko‘rsatiladigan maxsus headerlar
     )
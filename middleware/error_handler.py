@@ -3,47 +3,75 @@ Global xatoliklarni qayta ishlovchi middleware
 Barcha qayta ishlanmagan istisnolarni ushlab, chiroyli javob qaytaradi
 """
 
-from fastapi import Request, HTTPException
+from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.settings import settings
 
 
-async def error_handler_middleware(request: Request, call_next):
-    """Barcha xatoliklarni ushlash uchun middleware"""
-    try:
-        response = await call_next(request)
-        return response
+class ErrorHandlerMiddleware:
+    """
+    Barcha xatoliklarni ushlash uchun ASGI middleware
+    Javob boshlanib bo‘lgan bo‘lsa, uni almashtirib bo‘lmaydi -
+    xatolik loglanadi va yuqoriga uzatiladi
+    """
 
-    except HTTPException as e:
-        # FastAPI tomonidan ko‘tarilgan istisnolar
-        logger.warning(f"HTTP istisno: {e.status_code} - {e.detail}")
-        return JSONResponse(
-            status_code=e.status_code,
-            content={
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            return
+
+        except HTTPException as e:
+            if response_started:
+                raise
+            # FastAPI tomonidan ko‘tarilgan istisnolar
+            logger.warning(f"HTTP istisno: {e.status_code} - {e.detail}")
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={
+                    "status": "error",
+                    "message": e.detail,
+                    "error_code": e.status_code
+                }
+            )
+
+        except Exception as e:
+            # Boshqa barcha xatoliklar
+            logger.error(f"Qayta ishlanmagan xatolik: {str(e)}", exc_info=True)
+            if response_started:
+                raise
+
+            # Debug rejimida qo‘shimcha ma'lumot qaytariladi
+            error_detail = {
                 "status": "error",
-                "message": e.detail,
-                "error_code": e.status_code
+                "message": "Ichki server xatosi",
+                "error_code": 500
             }
-        )
-
-    except Exception as e:
-        # Boshqa barcha xatoliklar
-        logger.error(f"Qayta ishlanmagan xatolik: {str(e)}", exc_info=True)
-
-        # Debug rejimida qo‘shimcha ma'lumot qaytariladi
-        error_detail = {
-            "status": "error",
-            "message": "Ichki server xatosi",
-            "error_code": 500
-        }
-
-        if settings.DEBUG:
-            error_detail["details"] = str(e)
-            error_detail["type"] = type(e).__name__
-
-        return JSONResponse(
-            status_code=500,
-            content=error_detail
-        )
+
+            if settings.DEBUG:
+                error_detail["details"] = str(e)
+                error_detail["type"] = type(e).__name__
+
+            response = JSONResponse(
+                status_code=500,
+                content=error_detail
+            )
+
+        await response(scope, receive, send)
@@ -1,48 +1,124 @@
 """
 So‘rovlarni loglash uchun middleware
 Barcha kiruvchi so‘rovlar va chiqish javoblarini yozib boradi
+Xabarlar loguru'ga argumentlar bilan beriladi - formatlash faqat yozuv
+biror sink'ka o‘tganda bajariladi
 """
 
+import json
+import random
+import re
 import time
-from fastapi import Request
+import uuid
 from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from core.settings import settings
 
-async def logging_middleware(request: Request, call_next):
-    """Barcha so‘rovlarni loglash uchun middleware"""
-    start_time = time.time()
-    
-    # Mijozning IP manzilini olish
-    client_ip = request.client.host if request.client else "nomalum"
-    
-    # Kiruvchi so‘rovni loglash
-    logger.info(
-        f"→ {request.method} {request.url.path} "
-        f"mijoz: {client_ip} "
-        f"User-Agent: {request.headers.get('user-agent', 'nomalum')}"
-    )
-    
-    # So‘rovni qayta ishlash
-    response = await call_next(request)
-    
-    # Qayta ishlash vaqti (sekundda)
-    process_time = time.time() - start_time
-    
-    # Chiquvchi javobni loglash
-    log_level = "info"
-    if response.status_code >= 400:
-        log_level = "warning"
-    if response.status_code >= 500:
-        log_level = "error"
-    
-    getattr(logger, log_level)(
-        f"← {request.method} {request.url.path} "
-        f"→ {response.status_code} "
-        f"{process_time:.3f} soniyada bajarildi"
-    )
-    
-    # Javobga qo‘shimcha sarlavhalar qo‘shamiz
-    response.headers["X-Process-Time"] = str(process_time)
-    response.headers["X-Request-ID"] = str(id(request))  # Oddiy so‘rov ID
-    
-    return response
+# Bundan past darajadagi so‘rov loglari umuman yaratilmaydi
+ACCESS_LOG_LEVEL_NO = logger.level(settings.ACCESS_LOG_LEVEL.upper()).no
+INFO_NO = logger.level("INFO").no
+
+# Mijoz yuborgan X-Request-ID faqat xavfsiz belgilardan iborat bo‘lsa qabul qilinadi
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+def get_request_id(headers: Headers) -> str:
+    """Kiruvchi X-Request-ID ni olish yoki yangisini yaratish"""
+    incoming = headers.get("x-request-id")
+    if incoming and REQUEST_ID_PATTERN.fullmatch(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+def is_sampled() -> bool:
+    """Muvaffaqiyatli so‘rov loglanadimi (ACCESS_LOG_SAMPLE_RATE bo‘yicha)"""
+    rate = settings.ACCESS_LOG_SAMPLE_RATE
+    return rate >= 1.0 or random.random() < rate
+
+
+class LoggingMiddleware:
+    """
+    Barcha so‘rovlarni loglash uchun ASGI middleware
+    X-Process-Time javob sarlavhalari yuborilguncha o‘tgan vaqt,
+    log yozuvidagi vaqt esa javob tanasi to‘liq yuborilguncha o‘tgan vaqt
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        headers = Headers(scope=scope)
+        request_id = get_request_id(headers)
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_host = client[0] if client else None
+        json_mode = settings.ACCESS_LOG_FORMAT == "json"
+        # Xatoliklar har doim loglanadi, qolganlari tanlab olinadi
+        sampled = is_sampled()
+
+        # Kiruvchi so‘rovni loglash
+        if not json_mode and sampled and INFO_NO >= ACCESS_LOG_LEVEL_NO:
+            logger.bind(request_id=request_id).info(
+                "→ {} {} mijoz: {} User-Agent: {}",
+                method,
+                path,
+                client_host or "nomalum",
+                headers.get("user-agent", "nomalum"),
+            )
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Javobga qo‘shimcha sarlavhalar qo‘shamiz
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Process-Time"] = str(time.time() - start_time)
+                response_headers["X-Request-ID"] = request_id
+            await send(message)
+
+        # So‘rov ID si ichkaridagi barcha log yozuvlariga biriktiriladi
+        try:
+            with logger.contextualize(request_id=request_id):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            # Qayta ishlash vaqti (sekundda)
+            process_time = time.time() - start_time
+
+            # Chiquvchi javobni loglash
+            log_level = "INFO"
+            if status_code >= 400:
+                log_level = "WARNING"
+            if status_code >= 500:
+                log_level = "ERROR"
+
+            if (sampled or status_code >= 400) and logger.level(log_level).no >= ACCESS_LOG_LEVEL_NO:
+                if json_mode:
+                    logger.bind(access=True, request_id=request_id).log(log_level, json.dumps({
+                        "ts": start_time,
+                        "request_id": request_id,
+                        "method": method,
+                        "path": path,
+                        "status": status_code,
+                        "duration_ms": round(process_time * 1000, 3),
+                        "client": client_host,
+                        "user_agent": headers.get("user-agent"),
+                    }, ensure_ascii=False))
+                else:
+                    logger.bind(request_id=request_id).log(
+                        log_level,
+                        "← {} {} → {} {:.3f} soniyada bajarildi",
+                        method,
+                        path,
+                        status_code,
+                        process_time,
+                    )
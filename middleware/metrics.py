@@ -0,0 +1,47 @@
+"""
+So‘rov metrikalarini yig‘uvchi ASGI middleware
+Marshrut yo‘l shabloni bo‘yicha (masalan /api/echo/{item_id}) hisoblanadi -
+aniq URL'lar label'ga tushmaydi, shuning uchun seriyalar soni cheklangan
+"""
+
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import HTTP_DURATION, HTTP_IN_PROGRESS, HTTP_REQUESTS
+
+# Hech bir marshrutga mos kelmagan so‘rovlar (404) uchun label
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """So‘rovlar soni, davomiyligi va bajarilayotgan so‘rovlarni yozish"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc((method,))
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_IN_PROGRESS.dec((method,))
+            # FastAPI mos kelgan marshrutni scope["route"] ga yozadi
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            labels = (method, route, str(status_code))
+            HTTP_REQUESTS.inc(labels)
+            HTTP_DURATION.observe(duration, labels)
@@ -0,0 +1,34 @@
+"""
+Read-your-writes uchun middleware
+Muvaffaqiyatli yozuvdan (POST/PUT/PATCH/DELETE) keyin javobga qisqa muddatli
+cookie qo‘shiladi - shu vaqt ichida mijozning o‘qishlari asosiy bazaga boradi
+(core.dependencies.get_read_db), replikatsiya kechikishi ko‘rinmaydi
+"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.db import REPLICA_STICKY_COOKIE
+
+# Ma'lumotni o‘zgartiradigan metodlar
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ReplicaStickyMiddleware:
+    """Yozuvdan keyin sticky cookie qo‘yish (faqat replikalar sozlanganda ulanadi)"""
+
+    def __init__(self, app: ASGIApp, max_age: int = 5):
+        self.app = app
+        self.cookie = f"{REPLICA_STICKY_COOKIE}=1; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("Set-Cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
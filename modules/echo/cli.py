@@ -0,0 +1,62 @@
+"""
+Echo модуль - командная строка
+Импорт NDJSON-файла напрямую в базу (без HTTP):
+
+    python -m modules.echo.cli import echos.ndjson
+    gunzip -c echos.ndjson.gz | python -m modules.echo.cli import -
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO
+
+from core.db import init_database, close_database
+from core.logger import setup_logging
+from core.settings import settings
+from .funcs import pipeline
+from .services import echo_service
+
+# Размер блока чтения файла (строки собираются в ndjson_lines)
+READ_SIZE = 65536
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    """Файл блоками по READ_SIZE (чтение в отдельном потоке)"""
+    while chunk := await asyncio.to_thread(file.read, READ_SIZE):
+        yield chunk
+
+
+async def import_file(path: str, is_protected: bool = False) -> int:
+    """Импорт NDJSON-файла ("-" - stdin); код возврата 1 - были ошибки в строках, 2 - нет базы"""
+    if not await init_database():
+        await close_database()
+        return 2
+    pipeline.start(settings.ECHO_PROCESSOR_WORKERS)
+    try:
+        if path == "-":
+            result = await echo_service.import_ndjson(read_chunks(sys.stdin.buffer), is_protected)
+        else:
+            with open(path, "rb") as file:
+                result = await echo_service.import_ndjson(read_chunks(file), is_protected)
+    finally:
+        pipeline.stop()
+        await close_database()
+    print(result.model_dump_json(indent=2))
+    return 1 if result.failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m modules.echo.cli", description="Echo CLI")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Импорт echo из NDJSON")
+    import_parser.add_argument("path", help="NDJSON-файл или - для stdin")
+    import_parser.add_argument("--protected", action="store_true", help="Пометить как is_protected")
+    args = parser.parse_args()
+
+    setup_logging()
+    return asyncio.run(import_file(args.path, args.protected))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
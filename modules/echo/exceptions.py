@@ -2,8 +2,12 @@
 Echo moduliga oid istisno holatlar (xatoliklar)
 """
 
+from datetime import datetime
+from typing import Optional
 from fastapi import HTTPException, status
 
+from utils.helpers import http_date
+
 
 class EchoException(HTTPException):
     """Echo moduli uchun asosiy (bazaviy) istisno"""
@@ -28,6 +32,27 @@ class EchoValidationError(EchoException):
         )
 
 
+class EchoInvalidCursorError(EchoException):
+    """Sahifalash kursori noto‘g‘ri yoki soxtalashtirilgan bo‘lsa"""
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Kursor noto‘g‘ri"
+        )
+
+
+class EchoNotModifiedError(EchoException):
+    """Mijozdagi nusxa dolzarb - 304 Not Modified (tanasiz javob)"""
+    def __init__(self, etag: str, last_modified: Optional[datetime] = None):
+        headers = {"ETag": etag}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified)
+        super().__init__(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers
+        )
+
+
 class EchoAccessDeniedError(EchoException):
     """Foydalanuvchida ruxsat bo‘lmaganda (access denied)"""
     def __init__(self):
@@ -3,23 +3,157 @@ Echo moduli uchun yordamchi funksiyalar
 Ma’lumotlarni qayta ishlash mantiği
 """
 
-from typing import Optional
+import asyncio
+import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Type
+from pydantic import ValidationError
 from loguru import logger
 
+from core.settings import settings
+from utils.helpers import as_utc, make_etag
+from .schemas import EchoCreate, EchoBulkError, EchoResponse
+
+
+class Processor:
+    """
+    Xabarlarni qayta ishlovchi (ECHO_PROCESSORS zanjirining bir bo‘g‘ini)
+    Asosiy API - process_many: butun paket bitta chaqiruvda qayta ishlanadi.
+    cpu_bound=True - og‘ir o‘zgartirishlar, ECHO_PROCESSOR_WORKERS > 0 bo‘lsa
+    alohida jarayonlarda bajariladi (event loop bloklanmaydi)
+    """
+    name: str = ""
+    cpu_bound: bool = False
+
+    def process(self, message: str) -> str:
+        raise NotImplementedError
+
+    def process_many(self, messages: List[str]) -> List[str]:
+        return [self.process(message) for message in messages]
+
+
+# Nomi bo‘yicha ro‘yxatdan o‘tgan qayta ishlovchilar
+PROCESSORS: Dict[str, Processor] = {}
+
+
+def register_processor(cls: Type[Processor]) -> Type[Processor]:
+    """Qayta ishlovchi klassni ECHO_PROCESSORS da ishlatish uchun ro‘yxatga olish (dekorator)"""
+    PROCESSORS[cls.name] = cls()
+    return cls
+
+
+@register_processor
+class ReverseProcessor(Processor):
+    """Matnni teskari aylantirish"""
+    name = "reverse"
+
+    def process_many(self, messages: List[str]) -> List[str]:
+        return [message[::-1] for message in messages]
+
+
+@register_processor
+class StripProcessor(Processor):
+    """Boshi va oxiridagi bo‘sh joylarni olib tashlash"""
+    name = "strip"
+
+    def process_many(self, messages: List[str]) -> List[str]:
+        return [message.strip() for message in messages]
+
+
+@register_processor
+class LowerProcessor(Processor):
+    """Kichik harflarga o‘tkazish"""
+    name = "lower"
+
+    def process_many(self, messages: List[str]) -> List[str]:
+        return [message.lower() for message in messages]
+
+
+def run_processors(processors: Sequence[Processor], messages: List[str]) -> List[str]:
+    """Zanjirni paketga qo‘llash (jarayonlar pool'ida ham shu funksiya bajariladi)"""
+    for processor in processors:
+        messages = processor.process_many(messages)
+    return messages
+
+
+class ProcessorPipeline:
+    """
+    ECHO_PROCESSORS zanjiri
+    start() da cpu_bound bo‘g‘in bo‘lsa va workers > 0 bo‘lsa ProcessPoolExecutor
+    ochiladi; kichik paketlar (offload_min_batch dan kam) IPC narxiga arzimaydi
+    va joyida qayta ishlanadi
+    """
+
+    def __init__(self, names: Sequence[str], offload_min_batch: int = 64):
+        self.names = list(names)
+        self.offload_min_batch = offload_min_batch
+        self._processors: Optional[List[Processor]] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def processors(self) -> List[Processor]:
+        # Nomlar birinchi murojaatda aniqlanadi: boshqa modullar o‘z
+        # qayta ishlovchilarini import paytida ro‘yxatga olishga ulguradi
+        if self._processors is None:
+            unknown = [name for name in self.names if name not in PROCESSORS]
+            if unknown:
+                raise ValueError(f"Noma'lum qayta ishlovchilar: {', '.join(unknown)}")
+            self._processors = [PROCESSORS[name] for name in self.names]
+        return self._processors
+
+    def start(self, workers: int = 0) -> None:
+        """Zanjirni tekshirish va kerak bo‘lsa jarayonlar pool'ini ochish"""
+        processors = self.processors
+        if workers > 0 and any(processor.cpu_bound for processor in processors):
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+            logger.info(f"Xabarlar {workers} ta jarayonda qayta ishlanadi: {', '.join(self.names)}")
+
+    def stop(self) -> None:
+        """Jarayonlar pool'ini yopish (bajarilayotgan paketlar tugatiladi)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def process_many(self, messages: List[str]) -> List[str]:
+        """Paketni joriy oqimda qayta ishlash"""
+        processed = run_processors(self.processors, messages)
+        logger.opt(lazy=True).debug(
+            "Qayta ishlandi {} ta xabar: {}",
+            lambda: len(messages),
+            lambda: [f"{m[:20]}... -> {p[:20]}..." for m, p in zip(messages[:3], processed[:3])],
+        )
+        return processed
+
+    async def run(self, messages: List[str]) -> List[str]:
+        """Paketni qayta ishlash; og‘ir zanjir katta paketda jarayonlar pool'iga beriladi"""
+        if self._executor is None or len(messages) < self.offload_min_batch:
+            return self.process_many(messages)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, run_processors, self.processors, messages)
+
+
+pipeline = ProcessorPipeline(
+    settings.ECHO_PROCESSORS,
+    offload_min_batch=settings.ECHO_PROCESSOR_OFFLOAD_MIN_BATCH,
+)
+
 
 def process_message(message: str) -> str:
     """
-    Xabarni qayta ishlash
+    Bitta xabarni qayta ishlash (ECHO_PROCESSORS zanjiri)
     Misol: matnni teskari aylantirish
     """
     if not message:
         return ""
-    
-    # Oddiy qayta ishlash — matnni teskari aylantirish
-    processed = message[::-1]
-    
-    logger.debug(f"Qayta ishlangan xabar: {message[:20]}... -> {processed[:20]}...")
-    return processed
+    return pipeline.process_many([message])[0]
+
+
+async def process_messages(messages: List[str]) -> List[str]:
+    """Xabarlar paketini qayta ishlash (event loop'ni bloklamasdan)"""
+    if not messages:
+        return []
+    return await pipeline.run(messages)
 
 
 def validate_category(category: Optional[str]) -> bool:
@@ -34,6 +168,42 @@ def validate_category(category: Optional[str]) -> bool:
     return category.lower() in allowed_categories
 
 
+def validate_bulk_items(
+    items: List[Dict[str, Any]]
+) -> Tuple[List[EchoCreate], List[EchoBulkError]]:
+    """
+    Paket elementlarini alohida-alohida tekshirish
+    Xato elementlar paketni to‘xtatmaydi - indeksi bilan qaytariladi
+    """
+    valid: List[EchoCreate] = []
+    errors: List[EchoBulkError] = []
+    for index, raw in enumerate(items):
+        try:
+            valid.append(EchoCreate.model_validate(raw))
+        except ValidationError as e:
+            errors.append(EchoBulkError(
+                index=index,
+                errors=e.errors(include_url=False, include_context=False)
+            ))
+    return valid, errors
+
+
+def item_etag(item: Any) -> str:
+    """
+    Echo ETag'i: id va updated_at bo‘yicha
+    ORM qatori uchun ham, EchoResponse uchun ham mos
+    """
+    return make_etag(item.id, as_utc(item.updated_at).timestamp())
+
+
+def list_etag(items: Sequence[Any], total: Optional[int]) -> str:
+    """Sahifa ETag'i: sahifa tarkibi (id, updated_at) va total"""
+    return make_etag(
+        total,
+        *(f"{item.id}:{as_utc(item.updated_at).timestamp()}" for item in items)
+    )
+
+
 def format_response(message: str, processed: str) -> dict:
     """
     API javobini formatlash
@@ -44,3 +214,63 @@ def format_response(message: str, processed: str) -> dict:
         "length": len(message),
         "processed_length": len(processed)
     }
+
+
+def fts_query(query: str) -> str:
+    """
+    Foydalanuvchi so‘rovini SQLite FTS5 MATCH ifodasiga aylantirish
+    Har bir so‘z qo‘shtirnoqqa olinadi - FTS5 sintaksisi (AND, NEAR, * ...)
+    talqin qilinmaydi, so‘zlar AND bilan birlashadi
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+# CSV eksport ustunlari (EchoResponse tartibida)
+EXPORT_FIELDS = tuple(EchoResponse.model_fields)
+
+
+def ndjson_chunk(items: Sequence[EchoResponse]) -> bytes:
+    """Echo paketi NDJSON ko‘rinishida: har qatorda bitta JSON obyekt"""
+    return b"".join(item.model_dump_json().encode() + b"\n" for item in items)
+
+
+def csv_chunk(items: Sequence[EchoResponse], header: bool = False) -> bytes:
+    """Echo paketi CSV ko‘rinishida (header=True - birinchi paket sarlavha bilan)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for item in items:
+        writer.writerow(item.model_dump(mode="json").values())
+    return buffer.getvalue().encode()
+
+
+async def ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_size: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Baytlar oqimidan NDJSON qatorlari: (qator raqami, qator)
+    Xotirada faqat joriy tugallanmagan qator turadi; max_line_size dan uzun
+    qator tashlab yuboriladi va None sifatida beriladi. Bo‘sh qatorlar o‘tkazib yuboriladi
+    """
+    buffer = b""
+    number = 0
+    oversized = False
+    async for chunk in chunks:
+        *lines, rest = (buffer + chunk).split(b"\n")
+        for line in lines:
+            number += 1
+            if oversized or len(line) > max_line_size:
+                oversized = False
+                yield number, None
+            elif line.strip():
+                yield number, line
+        buffer = rest
+        if len(buffer) > max_line_size:
+            buffer = b""
+            oversized = True
+    if oversized:
+        yield number + 1, None
+    elif buffer.strip():
+        yield number + 1, buffer
@@ -1,15 +1,24 @@
 """
 Echo moduli uchun DB modellari
-SQLAlchemy ORM modeli
+SQLAlchemy ORM modeli va xabarlar bo‘yicha to‘liq matnli qidiruv indekslari
 """
 
-from sqlalchemy import Column, String, Text, Boolean
-from core.db import BaseModel
+from sqlalchemy import (
+    DDL, Boolean, Column, Index, Integer, MetaData, String, Table, Text,
+    event, func, text,
+)
+from core.db import BaseModel, schema_upgrades
+
+# To‘liq matnli qidiruv konfiguratsiyasi (PostgreSQL): xabarlar turli tillarda,
+# shuning uchun stemming'siz "simple"
+SEARCH_CONFIG = text("'simple'")
 
 
 class Echo(BaseModel):
     """Echo modeli"""
     __tablename__ = "echo_items"  # Jadval nomi
+    # Kategoriya va is_protected bo‘yicha filtrlangan ro‘yxatlar uchun (vaqt bo‘yicha tartiblangan)
+    __live_indexes__ = [("category", "created_at", "id"), ("is_protected", "created_at", "id")]
 
     message = Column(Text, nullable=False, comment="Kiruvchi xabar")
     category = Column(String(100), nullable=True, comment="Kategoriya")
@@ -18,3 +27,67 @@ class Echo(BaseModel):
 
     def __repr__(self):
         return f"<Echo(id={self.id}, message={self.message[:50]})>"
+
+
+# PostgreSQL: o‘chirilmagan xabarlar bo‘yicha tsvector GIN indeksi
+# (qidiruv so‘rovi aynan shu ifodadan foydalanadi)
+Index(
+    "ix_echo_items_live_message_fts",
+    func.to_tsvector(SEARCH_CONFIG, Echo.__table__.c.message),
+    postgresql_using="gin",
+    postgresql_where=text("deleted_at IS NULL"),
+).ddl_if(dialect="postgresql")
+
+
+# SQLite: FTS5 virtual jadvali, echo_items bilan rowid orqali bog‘langan.
+# Triggerlar faqat o‘chirilmagan yozuvlarni indeksda saqlaydi -
+# yaratish, tahrirlash va yumshoq o‘chirishda avtomatik yangilanadi
+echo_fts = Table(
+    "echo_items_fts",
+    MetaData(),  # create_all bu jadvalni yaratmaydi - quyidagi DDL orqali
+    Column("rowid", Integer, primary_key=True),
+    Column("message", Text),
+)
+
+_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS echo_items_fts USING fts5(message, tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS echo_items_fts_insert AFTER INSERT ON echo_items "
+    "WHEN new.deleted_at IS NULL BEGIN "
+    "INSERT INTO echo_items_fts(rowid, message) VALUES (new.rowid, new.message); END",
+    "CREATE TRIGGER IF NOT EXISTS echo_items_fts_update AFTER UPDATE OF message, deleted_at ON echo_items BEGIN "
+    "DELETE FROM echo_items_fts WHERE rowid = old.rowid; "
+    "INSERT INTO echo_items_fts(rowid, message) SELECT new.rowid, new.message WHERE new.deleted_at IS NULL; END",
+    "CREATE TRIGGER IF NOT EXISTS echo_items_fts_delete AFTER DELETE ON echo_items BEGIN "
+    "DELETE FROM echo_items_fts WHERE rowid = old.rowid; END",
+]
+
+for _statement in _FTS_DDL:
+    event.listen(Echo.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# drop_all virtual jadvalni bilmaydi - eski rowid'lar qolib ketmasligi uchun birga o‘chiriladi
+event.listen(
+    Echo.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS echo_items_fts").execute_if(dialect="sqlite"),
+)
+
+
+def ensure_fts(sync_conn) -> None:
+    """
+    FTS jadvali va triggerlarini mavjud SQLite bazasida yaratish
+    (after_create faqat yangi echo_items jadvali uchun ishlaydi).
+    Jadval yangi yaratilsa, o‘chirilmagan xabarlar bilan to‘ldiriladi
+    """
+    if sync_conn.dialect.name != "sqlite":
+        return
+    exists = sync_conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'echo_items_fts'"
+    ).first()
+    for statement in _FTS_DDL:
+        sync_conn.exec_driver_sql(statement)
+    if not exists:
+        sync_conn.exec_driver_sql(
+            "INSERT INTO echo_items_fts(rowid, message) "
+            "SELECT rowid, message FROM echo_items WHERE deleted_at IS NULL"
+        )
+
+
+schema_upgrades.append(ensure_fts)
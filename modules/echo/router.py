@@ -3,29 +3,47 @@ Echo модуль - роутер
 API эндпоинты для echo функциональности
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+import time
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from loguru import logger
 
-from core.dependencies import get_db, verify_bearer_token
-from shared.schemas.common import ResponseModel, PaginatedResponse, PaginationParams
-from .schemas import EchoRequest, EchoResponse, EchoCreate
+from core.db import release
+from core.dependencies import (
+    get_db, get_read_db, get_read_engine, get_conditional_headers, query_model, verify_bearer_token
+)
+from shared.schemas.common import ResponseModel, PaginatedResponse, PaginationParams, ConditionalHeaders
+from utils.helpers import http_date, model_response
+from .schemas import (
+    EchoRequest, EchoResponse, EchoCreate, EchoBulkCreate, EchoBulkResponse, EchoFilterParams,
+    EchoImportResponse, ExportFormat
+)
 from .services import echo_service
-from .exceptions import EchoNotFoundError
+from .funcs import validate_bulk_items, item_etag, list_etag, ndjson_chunk, csv_chunk
+from .exceptions import EchoException, EchoNotFoundError
 
 router = APIRouter()
 
 
 @router.get("/", response_model=PaginatedResponse[EchoResponse])
 async def get_echos(
-    pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    pagination: PaginationParams = Depends(query_model(PaginationParams)),
+    filters: EchoFilterParams = Depends(query_model(EchoFilterParams)),
+    conditional: ConditionalHeaders = Depends(get_conditional_headers),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Получить список всех echo"""
+    """Получить список echo (фильтры, сортировка, page или cursor, поддерживает If-None-Match)"""
     try:
-        items, total = await echo_service.get_all(db, pagination)
-        return PaginatedResponse.create(items, total, pagination)
+        items, total, next_cursor = await echo_service.get_all(db, pagination, conditional, filters)
+        # Соединение возвращается в пул до сериализации ответа
+        await release(db)
+        # Список проверяется только по ETag (без Last-Modified)
+        page = PaginatedResponse[EchoResponse].create(items, total, pagination, next_cursor)
+        return model_response(page, headers={"ETag": list_etag(items, total)})
+    except EchoException:
+        raise
     except Exception as e:
         logger.error(f"Error getting echos: {e}")
         raise HTTPException(
@@ -34,15 +52,84 @@ async def get_echos(
         )
 
 
+@router.get("/search", response_model=PaginatedResponse[EchoResponse])
+async def search_echos(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    category: Optional[str] = Query(None, max_length=100, description="Фильтр по категории"),
+    pagination: PaginationParams = Depends(query_model(PaginationParams)),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Полнотекстовый поиск echo по сообщению (ранжированный, фильтр по category)"""
+    try:
+        items, total = await echo_service.search(db, q, pagination, category)
+        await release(db)
+        return model_response(PaginatedResponse[EchoResponse].create(items, total, pagination))
+    except Exception as e:
+        logger.error(f"Error searching echos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search echos"
+        )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_echos(
+    format: ExportFormat = Query(ExportFormat.ndjson, description="Формат: ndjson или csv"),
+    filters: EchoFilterParams = Depends(query_model(EchoFilterParams)),
+    bind: AsyncEngine = Depends(get_read_engine)
+):
+    """
+    Потоковая выгрузка всех echo по фильтрам (NDJSON или CSV)
+    Пачки читаются по мере отправки: если клиент читает медленно, чтение
+    из БД приостанавливается. gzip/br - через Accept-Encoding (CompressionMiddleware)
+    """
+    async def body() -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        rows = 0
+        completed = False
+        try:
+            async for items in echo_service.export(bind, filters):
+                if format is ExportFormat.csv:
+                    yield csv_chunk(items, header=rows == 0)
+                else:
+                    yield ndjson_chunk(items)
+                rows += len(items)
+            if format is ExportFormat.csv and rows == 0:
+                yield csv_chunk([], header=True)
+            completed = True
+        finally:
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Exported {rows} echos as {format.value} in {elapsed:.3f}s "
+                f"({rows / elapsed if elapsed else 0:.0f} rows/s)"
+                + ("" if completed else ", aborted")
+            )
+
+    media_type = "text/csv" if format is ExportFormat.csv else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="echos.{format.value}"'}
+    )
+
+
 @router.get("/{item_id}", response_model=ResponseModel[EchoResponse])
 async def get_echo(
     item_id: str,
-    db: AsyncSession = Depends(get_db)
+    conditional: ConditionalHeaders = Depends(get_conditional_headers),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Получить echo по ID"""
+    """Получить echo по ID (поддерживает If-None-Match / If-Modified-Since)"""
     try:
-        item = await echo_service.get_by_id(db, item_id)
-        return ResponseModel(data=item)
+        item = await echo_service.get_by_id(db, item_id, conditional)
+        await release(db)
+        return model_response(
+            ResponseModel[EchoResponse](data=item),
+            headers={
+                "ETag": item_etag(item),
+                "Last-Modified": http_date(item.updated_at),
+            }
+        )
     except EchoNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,10 +145,10 @@ async def create_echo(
     """Создать новый echo"""
     try:
         item = await echo_service.create(db, request)
-        return ResponseModel(
+        return model_response(ResponseModel[EchoResponse](
             data=item,
             message=f"Echo created successfully"
-        )
+        ))
     except Exception as e:
         logger.error(f"Error creating echo: {e}")
         raise HTTPException(
@@ -70,6 +157,50 @@ async def create_echo(
         )
 
 
+@router.post("/bulk", response_model=ResponseModel[EchoBulkResponse])
+async def create_echos_bulk(
+    request: EchoBulkCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Массово создать echo (невалидные элементы возвращаются в errors)"""
+    valid_items, errors = validate_bulk_items(request.items)
+    try:
+        items = await echo_service.create_many(db, valid_items)
+        return model_response(ResponseModel[EchoBulkResponse](
+            data=EchoBulkResponse(items=items, errors=errors),
+            message=f"Created {len(items)} echos, {len(errors)} failed validation"
+        ))
+    except Exception as e:
+        logger.error(f"Error bulk creating echos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create echos"
+        )
+
+
+@router.post("/import",
+    response_model=ResponseModel[EchoImportResponse],
+    dependencies=[Depends(verify_bearer_token)]
+)
+async def import_echos(request: Request):
+    """
+    Потоковый импорт echo из NDJSON-тела (одна EchoCreate на строку)
+    Тело читается по мере обработки, ошибочные строки возвращаются в errors
+    """
+    try:
+        result = await echo_service.import_ndjson(request.stream())
+        return model_response(ResponseModel[EchoImportResponse](
+            data=result,
+            message=f"Imported {result.imported} echos, {result.failed} lines failed"
+        ))
+    except Exception as e:
+        logger.error(f"Error importing echos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to import echos"
+        )
+
+
 @router.post("/protected", 
     response_model=ResponseModel[EchoResponse],
     dependencies=[Depends(verify_bearer_token)]
@@ -81,10 +212,10 @@ async def create_protected_echo(
     """Создать echo (защищенный эндпоинт)"""
     try:
         item = await echo_service.create(db, request, is_protected=True)
-        return ResponseModel(
+        return model_response(ResponseModel[EchoResponse](
             data=item,
             message=f"Protected echo created successfully"
-        )
+        ))
     except Exception as e:
         logger.error(f"Error creating protected echo: {e}")
         raise HTTPException(
@@ -3,12 +3,20 @@
 Pydantic модели для входных и выходных данных
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 import uuid
 
-from shared.schemas.common import BaseSchema
+from core.settings import settings
+from shared.schemas.common import BaseSchema, FilterParams
+from .constants import ALLOWED_CATEGORIES
+
+
+def normalize_category(value: Optional[str]) -> Optional[str]:
+    """Категории хранятся и сравниваются в нижнем регистре (фильтр использует индекс без lower())"""
+    return value.lower() if value is not None else None
 
 
 class EchoBase(BaseModel):
@@ -16,6 +24,8 @@ class EchoBase(BaseModel):
     message: str = Field(..., min_length=1, max_length=1000, description="Сообщение")
     category: Optional[str] = Field(None, max_length=100, description="Категория")
 
+    _normalize_category = field_validator("category")(normalize_category)
+
 
 class EchoCreate(EchoBase):
     """Схема создания echo"""
@@ -27,6 +37,8 @@ class EchoUpdate(BaseModel):
     message: Optional[str] = Field(None, min_length=1, max_length=1000)
     category: Optional[str] = Field(None, max_length=100)
 
+    _normalize_category = field_validator("category")(normalize_category)
+
 
 class EchoResponse(BaseSchema):
     """Ответ с данными echo"""
@@ -39,7 +51,70 @@ class EchoResponse(BaseSchema):
         from_attributes = True
 
 
+class EchoFilterParams(FilterParams):
+    """Фильтры списка echo (у category и is_protected свои индексы (фильтр, created_at, id))"""
+    category: Optional[str] = Field(None, description=f"Категория: {', '.join(ALLOWED_CATEGORIES)}")
+    is_protected: Optional[bool] = Field(None, description="Только защищённые / только обычные")
+
+    @field_validator("category")
+    @classmethod
+    def _check_category(cls, value: Optional[str]) -> Optional[str]:
+        value = normalize_category(value)
+        if value is not None and value not in ALLOWED_CATEGORIES:
+            raise ValueError(f"Недопустимая категория, разрешены: {', '.join(ALLOWED_CATEGORIES)}")
+        return value
+
+    def conditions(self, model) -> List[Any]:
+        conditions = super().conditions(model)
+        if self.category is not None:
+            conditions.append(model.category == self.category)
+        if self.is_protected is not None:
+            conditions.append(model.is_protected == self.is_protected)
+        return conditions
+
+
+class ExportFormat(str, Enum):
+    """Формат выгрузки echo"""
+    ndjson = "ndjson"
+    csv = "csv"
+
+
 class EchoRequest(BaseModel):
     """Запрос для обработки echo"""
     message: str = Field(..., min_length=1, max_length=1000)
     options: Optional[dict] = Field(None, description="Дополнительные опции")
+
+
+class EchoBulkCreate(BaseModel):
+    """Схема массового создания echo (элементы валидируются по отдельности)"""
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.ECHO_BULK_MAX_ITEMS,
+        description="Список echo для создания"
+    )
+
+
+class EchoBulkError(BaseModel):
+    """Ошибка валидации одного элемента пакета"""
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class EchoBulkResponse(BaseModel):
+    """Результат массового создания echo"""
+    items: List[EchoResponse]
+    errors: List[EchoBulkError] = []
+
+
+class EchoImportError(BaseModel):
+    """Ошибка одной строки NDJSON-импорта"""
+    line: int = Field(..., description="Номер строки (с 1)")
+    errors: List[Dict[str, Any]]
+
+
+class EchoImportResponse(BaseModel):
+    """Результат импорта (errors ограничен ECHO_IMPORT_MAX_ERRORS, failed - все ошибки)"""
+    imported: int = 0
+    failed: int = 0
+    errors: List[EchoImportError] = []
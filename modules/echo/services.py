@@ -3,79 +3,306 @@
 Бизнес-логика и работа с базой данных
 """
 
-from typing import List, Tuple, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from datetime import datetime
+from typing import AsyncIterator, List, Tuple, Optional
+import uuid
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy import select, func, insert, literal_column, tuple_
+from pydantic import ValidationError
 from loguru import logger
 
-from shared.schemas.common import PaginationParams
-from .models import Echo
-from .schemas import EchoCreate, EchoResponse
-from .funcs import process_message
-from .exceptions import EchoNotFoundError
+from core.settings import settings
+from core.batching import WriteBatcher
+from core.cache import MISSING, CacheBackend, create_cache
+from core.db import SessionLocal, gather_reads, is_replica, new_uuid, utcnow
+from core.pagination import CountStrategy, get_count_strategy
+from shared.schemas.common import ConditionalHeaders, PaginationParams
+from utils.helpers import encode_cursor, decode_cursor
+from .models import Echo, SEARCH_CONFIG, echo_fts
+from .schemas import (
+    EchoCreate, EchoFilterParams, EchoImportError, EchoImportResponse, EchoResponse, normalize_category
+)
+from .funcs import process_messages, item_etag, list_etag, fts_query, ndjson_lines
+from .exceptions import EchoNotFoundError, EchoInvalidCursorError, EchoNotModifiedError
+
+
+# Колонки, нужные для EchoResponse: читаются как Core-строки, без ORM-объектов
+RESPONSE_COLUMNS = (
+    Echo.id,
+    Echo.created_at,
+    Echo.updated_at,
+    Echo.message,
+    Echo.category,
+    Echo.processed_message,
+    Echo.is_protected,
+)
+
+
+def to_response(row) -> EchoResponse:
+    """
+    EchoResponse из строки БД или ORM-объекта без повторной валидации
+    (типы уже гарантированы колонками)
+    """
+    return EchoResponse.model_construct(
+        id=row.id,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        message=row.message,
+        category=row.category,
+        processed_message=row.processed_message,
+        is_protected=row.is_protected,
+    )
 
 
 class EchoService:
     """Сервис для работы с echo"""
     
+    def __init__(
+        self,
+        counter: Optional[CountStrategy] = None,
+        cache: Optional[CacheBackend] = None
+    ):
+        # Стратегия подсчёта total (exact / cached / estimated)
+        self.counter = counter or get_count_strategy()
+        # Read-through кэш для get_by_id (None в кэше - echo не найден)
+        self.cache = cache or create_cache(
+            "echo",
+            max_size=settings.ECHO_CACHE_MAX_SIZE,
+            enabled=settings.ECHO_CACHE_ENABLED,
+            model=EchoResponse,
+        )
+        # Очередь отложенной записи для create (включается в lifespan)
+        self.write_batcher: Optional[WriteBatcher] = None
+    
+    @staticmethod
+    def _encode_cursor(item, filters: EchoFilterParams) -> str:
+        """
+        Курсор на позицию (created_at, id) последнего элемента страницы
+        Отпечаток фильтров и сортировки подписывается вместе с позицией
+        """
+        return encode_cursor([item.created_at.isoformat(), item.id.hex, filters.fingerprint()])
+
+    @staticmethod
+    def _decode_cursor(cursor: str, filters: EchoFilterParams) -> Tuple[datetime, uuid.UUID]:
+        """
+        Разобрать и проверить подпись курсора
+        Курсор, выданный для других фильтров или order, отклоняется (400):
+        иначе позиция применилась бы к чужому окну
+        """
+        try:
+            created_at, item_id, fingerprint = decode_cursor(cursor)
+            if fingerprint != filters.fingerprint():
+                raise ValueError("Курсор выдан для других фильтров")
+            return datetime.fromisoformat(created_at), uuid.UUID(item_id)
+        except (ValueError, TypeError):
+            raise EchoInvalidCursorError()
+
+    @staticmethod
+    def _seek(query, filters: EchoFilterParams, after: Tuple[datetime, uuid.UUID]):
+        """Keyset: строки после позиции (created_at, id) в направлении сортировки"""
+        position = tuple_(Echo.created_at, Echo.id)
+        return query.where(position < after if filters.descending else position > after)
+
     async def get_all(
         self, 
         db: AsyncSession, 
-        pagination: PaginationParams
-    ) -> Tuple[List[EchoResponse], int]:
-        """Получить все echo с пагинацией"""
-        # Запрос с пагинацией
-        query = select(Echo).where(
-            Echo.deleted_at.is_(None)
-        ).offset(pagination.skip).limit(pagination.limit)
+        pagination: PaginationParams,
+        conditional: Optional[ConditionalHeaders] = None,
+        filters: Optional[EchoFilterParams] = None
+    ) -> Tuple[List[EchoResponse], Optional[int], Optional[str]]:
+        """
+        Получить все echo с пагинацией, фильтрами и сортировкой
+        С курсором используется keyset-пагинация по (created_at, id)
+        в направлении сортировки - её стоимость не зависит от глубины страницы.
+        Если страница не изменилась (conditional, по ETag), бросается EchoNotModifiedError
+        ещё до построения EchoResponse
+        """
+        filters = filters or EchoFilterParams()
+        query = filters.apply(
+            select(*RESPONSE_COLUMNS).where(Echo.deleted_at.is_(None)),
+            Echo
+        )
         
-        result = await db.execute(query)
-        items = result.scalars().all()
+        if pagination.cursor:
+            query = self._seek(query, filters, self._decode_cursor(pagination.cursor, filters))
+        else:
+            query = query.offset(pagination.skip)
         
-        # Общее количество
-        count_query = select(func.count(Echo.id)).where(
-            Echo.deleted_at.is_(None)
-        )
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
+        # Общее количество (можно отключить через include_total=false)
+        conditions = filters.conditions(Echo)
+        count_query = select(func.count(Echo.id)).where(Echo.deleted_at.is_(None), *conditions)
+        
+        async def fetch_items(session: AsyncSession):
+            # Лишняя строка показывает, есть ли следующая страница
+            result = await session.execute(query.limit(pagination.limit + 1))
+            return result.all()
+        
+        async def fetch_total(session: AsyncSession):
+            return await self.counter.count(
+                session, count_query, Echo.__tablename__, filtered=bool(conditions)
+            )
+        
+        # Страница и total читаются параллельно на разных соединениях пула
+        reads = [fetch_items, fetch_total] if pagination.include_total else [fetch_items]
+        items, *rest = await gather_reads(db, *reads)
+        total = rest[0] if rest else None
+        
+        next_cursor = None
+        if len(items) > pagination.limit:
+            items = items[:pagination.limit]
+            next_cursor = self._encode_cursor(items[-1], filters)
+        
+        # Только ETag: удаление сдвигает на страницу более старые строки,
+        # не увеличивая max(updated_at), поэтому If-Modified-Since для списка неверен
+        if conditional is not None:
+            self._check_not_modified(conditional, list_etag(items, total), None)
         
         # Преобразование в схемы
-        response_items = []
-        for item in items:
-            response_items.append(EchoResponse(
-                id=item.id,
-                created_at=item.created_at,
-                updated_at=item.updated_at,
-                message=item.message,
-                category=item.category,
-                processed_message=item.processed_message,
-                is_protected=item.is_protected
-            ))
+        response_items = [to_response(row) for row in items]
         
         logger.info(f"Retrieved {len(response_items)} echos")
-        return response_items, total
+        return response_items, total, next_cursor
     
-    async def get_by_id(self, db: AsyncSession, item_id: str) -> EchoResponse:
-        """Получить echo по ID"""
-        query = select(Echo).where(
-            Echo.id == item_id,
+    async def export(
+        self,
+        bind: AsyncEngine,
+        filters: EchoFilterParams,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[List[EchoResponse]]:
+        """
+        Выгрузка всех echo по фильтрам пачками по batch_size
+        Каждая пачка читается keyset-запросом в своей короткой сессии:
+        соединение возвращается в пул до того, как пачка уходит клиенту,
+        поэтому медленный клиент не держит соединение, а память
+        ограничена размером пачки независимо от размера таблицы
+        """
+        batch_size = batch_size or settings.ECHO_EXPORT_BATCH_SIZE
+        query = filters.apply(
+            select(*RESPONSE_COLUMNS).where(Echo.deleted_at.is_(None)),
+            Echo
+        ).limit(batch_size)
+        after = None
+        while True:
+            async with SessionLocal(bind=bind) as session:
+                batch_query = query if after is None else self._seek(query, filters, after)
+                rows = (await session.execute(batch_query)).all()
+            if not rows:
+                return
+            yield [to_response(row) for row in rows]
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        q: str,
+        pagination: PaginationParams,
+        category: Optional[str] = None
+    ) -> Tuple[List[EchoResponse], Optional[int]]:
+        """
+        Полнотекстовый поиск по сообщениям: по релевантности, затем по времени
+        PostgreSQL - GIN индекс по to_tsvector, SQLite - FTS5 таблица echo_items_fts.
+        Оба индекса содержат только неудалённые записи
+        """
+        if not q.split():
+            return [], 0 if pagination.include_total else None
+        
+        if db.bind.dialect.name == "postgresql":
+            document = func.to_tsvector(SEARCH_CONFIG, Echo.message)
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+            source = Echo.__table__
+            match = document.op("@@")(ts_query)
+            relevance = func.ts_rank(document, ts_query).desc()
+        else:
+            source = echo_fts.join(
+                Echo.__table__, literal_column("echo_items.rowid") == echo_fts.c.rowid
+            )
+            match = echo_fts.c.message.op("MATCH")(fts_query(q))
+            # bm25: чем меньше, тем релевантнее
+            relevance = literal_column("echo_items_fts.rank").asc()
+        
+        conditions = [match, Echo.deleted_at.is_(None)]
+        if category:
+            conditions.append(Echo.category == normalize_category(category))
+        
+        query = select(*RESPONSE_COLUMNS).select_from(source).where(*conditions).order_by(
+            relevance, Echo.created_at.desc(), Echo.id.desc()
+        ).offset(pagination.skip).limit(pagination.limit)
+        count_query = select(func.count()).select_from(source).where(*conditions)
+        
+        async def fetch_items(session: AsyncSession):
+            result = await session.execute(query)
+            return result.all()
+        
+        async def fetch_total(session: AsyncSession):
+            return await session.scalar(count_query)
+        
+        reads = [fetch_items, fetch_total] if pagination.include_total else [fetch_items]
+        items, *rest = await gather_reads(db, *reads)
+        total = rest[0] if rest else None
+        
+        logger.info(f"Search '{q}' found {len(items)} echos")
+        return [to_response(row) for row in items], total
+    
+    @staticmethod
+    def _parse_id(item_id: str) -> uuid.UUID:
+        """ID из пути; некорректный UUID не может существовать - 404"""
+        try:
+            return uuid.UUID(str(item_id))
+        except ValueError:
+            raise EchoNotFoundError()
+    
+    @staticmethod
+    def _check_not_modified(
+        conditional: ConditionalHeaders,
+        etag: str,
+        modified_at: Optional[datetime]
+    ) -> None:
+        """Бросить 304, если у клиента актуальная версия"""
+        if conditional.not_modified(etag, modified_at):
+            raise EchoNotModifiedError(etag, modified_at)
+    
+    async def get_by_id(
+        self,
+        db: AsyncSession,
+        item_id: str,
+        conditional: Optional[ConditionalHeaders] = None
+    ) -> EchoResponse:
+        """Получить echo по ID (read-through кэш, 404 тоже кэшируются кратко; с реплик кэш не заполняется)"""
+        item_uuid = self._parse_id(item_id)
+        cache_key = item_uuid.hex
+        
+        cached = await self.cache.get(cache_key)
+        if cached is not MISSING:
+            if cached is None:
+                raise EchoNotFoundError()
+            if conditional is not None:
+                self._check_not_modified(conditional, item_etag(cached), cached.updated_at)
+            return cached
+        
+        query = select(*RESPONSE_COLUMNS).where(
+            Echo.id == item_uuid,
             Echo.deleted_at.is_(None)
         )
         result = await db.execute(query)
-        item = result.scalar_one_or_none()
+        item = result.first()
+        # Кэш заполняется только с основной базы: реплика может отставать
+        # и вернуть уже удалённый echo на всё время TTL
+        fill_cache = not is_replica(db.bind)
         
         if not item:
+            if fill_cache:
+                await self.cache.set(cache_key, None, settings.ECHO_CACHE_NEGATIVE_TTL)
             raise EchoNotFoundError()
         
-        return EchoResponse(
-            id=item.id,
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-            message=item.message,
-            category=item.category,
-            processed_message=item.processed_message,
-            is_protected=item.is_protected
-        )
+        if conditional is not None:
+            self._check_not_modified(conditional, item_etag(item), item.updated_at)
+        
+        response = to_response(item)
+        if fill_cache:
+            await self.cache.set(cache_key, response, settings.ECHO_CACHE_TTL)
+        return response
     
     async def create(
         self, 
@@ -84,37 +311,171 @@ class EchoService:
         is_protected: bool = False
     ) -> EchoResponse:
         """Создать новый echo"""
-        # Обработка сообщения
-        processed_message = process_message(data.message)
-        
-        # Создание модели
-        item = Echo(
-            message=data.message,
-            category=data.category,
-            processed_message=processed_message,
-            is_protected=is_protected
-        )
+        # Режим отложенной записи: вставка объединяется с соседними запросами
+        if self.write_batcher is not None and self.write_batcher.running:
+            return await self.write_batcher.submit(self._build_row(data, is_protected))
         
-        db.add(item)
-        await db.commit()
-        await db.refresh(item)
+        # Тот же Core INSERT ... RETURNING, что и у bulk/пакетной записи:
+        # ответ строится из значений базы и совпадает с последующими GET
+        item, = await self._insert_rows(db, [self._build_row(data, is_protected)])
         
         logger.info(f"Created echo with ID: {item.id}")
         
-        return EchoResponse(
-            id=item.id,
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-            message=item.message,
-            category=item.category,
-            processed_message=item.processed_message,
-            is_protected=item.is_protected
+        return item
+    
+    async def create_many(
+        self,
+        db: AsyncSession,
+        items: List[EchoCreate],
+        is_protected: bool = False
+    ) -> List[EchoResponse]:
+        """
+        Массовое создание echo
+        Многострочный INSERT ... RETURNING (пачками по ECHO_BULK_BATCH_SIZE)
+        и один commit на весь пакет
+        """
+        if not items:
+            return []
+        
+        rows = [self._build_row(data, is_protected) for data in items]
+        response_items = await self._insert_rows(db, rows)
+        
+        logger.info(f"Bulk created {len(response_items)} echos")
+        return response_items
+    
+    @staticmethod
+    def _build_row(data: EchoCreate, is_protected: bool) -> dict:
+        """
+        Строка для вставки в echo_items
+        processed_message заполняется пачкой в _process_rows перед записью
+        """
+        return {
+            "message": data.message,
+            "category": data.category,
+            "is_protected": is_protected,
+        }
+    
+    @staticmethod
+    async def _process_rows(rows: List[dict]) -> None:
+        """processed_message для всей пачки одним вызовом цепочки обработчиков"""
+        processed = await process_messages([row["message"] for row in rows])
+        for row, processed_message in zip(rows, processed):
+            row["processed_message"] = processed_message
+    
+    async def _insert_rows(self, db: AsyncSession, rows: List[dict]) -> List[EchoResponse]:
+        """Многострочный INSERT ... RETURNING и один commit"""
+        await self._process_rows(rows)
+        # Core-вставка: ORM bulk insert дробит пакет по набору не-NULL ключей
+        query = insert(Echo.__table__).returning(
+            *RESPONSE_COLUMNS,
+            sort_by_parameter_order=True,
+        ).execution_options(insertmanyvalues_page_size=settings.ECHO_BULK_BATCH_SIZE)
+        
+        result = await db.execute(query, rows)
+        response_items = [to_response(row) for row in result]
+        await db.commit()
+        self.counter.invalidate(Echo.__tablename__)
+        await self.cache.delete(*(item.id.hex for item in response_items))
+        return response_items
+    
+    async def import_ndjson(
+        self,
+        chunks: AsyncIterator[bytes],
+        is_protected: bool = False
+    ) -> EchoImportResponse:
+        """
+        Потоковый импорт echo из NDJSON (тело запроса или файл)
+        Каждая строка валидируется EchoCreate; ошибочные строки попадают
+        в errors и не прерывают импорт. Валидные строки пишутся пачками
+        по ECHO_IMPORT_CHUNK_SIZE (отдельный commit на пачку), поэтому
+        память не зависит от размера входных данных
+        """
+        result = EchoImportResponse()
+        chunk: List[EchoCreate] = []
+
+        def fail(line: int, errors: List[dict]) -> None:
+            result.failed += 1
+            if len(result.errors) < settings.ECHO_IMPORT_MAX_ERRORS:
+                result.errors.append(EchoImportError(line=line, errors=errors))
+
+        try:
+            async for number, line in ndjson_lines(chunks, settings.ECHO_IMPORT_MAX_LINE_BYTES):
+                if line is None:
+                    fail(number, [{"type": "line_too_long", "msg": "Строка длиннее ECHO_IMPORT_MAX_LINE_BYTES"}])
+                    continue
+                try:
+                    chunk.append(EchoCreate.model_validate_json(line))
+                except ValidationError as e:
+                    fail(number, e.errors(include_url=False, include_context=False))
+                    continue
+                if len(chunk) >= settings.ECHO_IMPORT_CHUNK_SIZE:
+                    result.imported += await self._write_import_chunk(chunk, is_protected)
+                    chunk = []
+            if chunk:
+                result.imported += await self._write_import_chunk(chunk, is_protected)
+        finally:
+            if result.imported:
+                self.counter.invalidate(Echo.__tablename__)
+
+        logger.info(f"Imported {result.imported} echos, {result.failed} lines failed")
+        return result
+
+    async def _write_import_chunk(self, chunk: List[EchoCreate], is_protected: bool) -> int:
+        """
+        Запись пачки импорта в своей транзакции
+        PostgreSQL - COPY (copy_records_to_table), остальные - executemany.
+        id и временные метки задаются здесь: COPY не выполняет Python-умолчания
+        """
+        now = utcnow()
+        rows = [
+            {"id": new_uuid(), "created_at": now, "updated_at": now, **self._build_row(data, is_protected)}
+            for data in chunk
+        ]
+        await self._process_rows(rows)
+        async with SessionLocal() as session:
+            if session.bind.dialect.name == "postgresql":
+                connection = await (await session.connection()).get_raw_connection()
+                await connection.driver_connection.copy_records_to_table(
+                    Echo.__tablename__,
+                    records=[tuple(row.values()) for row in rows],
+                    columns=list(rows[0]),
+                )
+            else:
+                await session.execute(insert(Echo.__table__), rows)
+            await session.commit()
+        return len(rows)
+
+    async def _flush_writes(self, rows: List[dict]) -> List[EchoResponse]:
+        """Запись накопленного пакета отдельной сессией"""
+        async with SessionLocal() as session:
+            response_items = await self._insert_rows(session, rows)
+        logger.info(f"Batched write of {len(response_items)} echos")
+        return response_items
+    
+    async def start_write_batching(self) -> None:
+        """Включить отложенную пакетную запись (ECHO_WRITE_BATCHING)"""
+        if not settings.ECHO_WRITE_BATCHING:
+            return
+        self.write_batcher = WriteBatcher(
+            self._flush_writes,
+            max_size=settings.ECHO_WRITE_BATCH_MAX_SIZE,
+            max_delay=settings.ECHO_WRITE_BATCH_MAX_DELAY,
+            name="echo-writes",
+            max_queue=settings.ECHO_WRITE_BATCH_MAX_QUEUE,
         )
+        await self.write_batcher.start()
+    
+    async def stop_write_batching(self) -> None:
+        """Дописать очередь и выключить пакетную запись"""
+        if self.write_batcher is not None:
+            await self.write_batcher.stop()
+            self.write_batcher = None
     
     async def delete(self, db: AsyncSession, item_id: str) -> bool:
         """Мягкое удаление echo"""
+        item_uuid = self._parse_id(item_id)
         query = select(Echo).where(
-            Echo.id == item_id,
+            Echo.id == item_uuid,
             Echo.deleted_at.is_(None)
         )
         result = await db.execute(query)
@@ -125,6 +486,8 @@ class EchoService:
         
         item.soft_delete()
         await db.commit()
+        self.counter.invalidate(Echo.__tablename__)
+        await self.cache.delete(item_uuid.hex)
         
         logger.info(f"Soft deleted echo with ID: {item_id}")
         return True
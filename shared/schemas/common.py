@@ -3,11 +3,15 @@ Ilovaning umumiy sxemalari
 Javoblar, sahifalash (pagination) va boshqa umumiy modellar
 """
 
+import hashlib
+from enum import Enum
 from typing import Generic, TypeVar, Optional, List, Any, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
 import uuid
 
+from utils.helpers import as_utc, etag_matches, not_modified_since
+
 T = TypeVar('T')
 
 
@@ -30,6 +34,11 @@ class PaginationParams(BaseModel):
     """Sahifalash parametrlar modeli"""
     page: int = Field(1, ge=1, description="Sahifa raqami")
     page_size: int = Field(20, ge=1, le=100, description="Sahifadagi elementlar soni")
+    cursor: Optional[str] = Field(
+        None,
+        description="Keyingi sahifa kursori (berilsa, page e'tiborga olinmaydi)"
+    )
+    include_total: bool = Field(True, description="Umumiy sonni hisoblash (total, pages)")
 
     @property
     def skip(self) -> int:
@@ -42,28 +51,109 @@ class PaginationParams(BaseModel):
         return self.page_size
 
 
+class SortOrder(str, Enum):
+    """Tartiblash yo'nalishi"""
+    asc = "asc"
+    desc = "desc"
+
+
+class FilterParams(BaseModel):
+    """
+    Ro'yxatlar uchun umumiy filtr va tartiblash parametrlari
+    Modullar meros olib o'z maydonlarini va conditions() ni kengaytiradi.
+    Tartib (created_at, id) bo'yicha - BaseModel'dagi keyset indeksiga mos,
+    created_at oralig'i ham shu indeks bo'yicha qidiriladi
+    """
+    created_after: Optional[datetime] = Field(None, description="created_at >= (ISO 8601)")
+    created_before: Optional[datetime] = Field(None, description="created_at < (ISO 8601)")
+    order: SortOrder = Field(SortOrder.desc, description="created_at bo'yicha tartib: asc yoki desc")
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def _to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Bazadagi vaqtlar UTC'da - vaqt zonasisiz qiymat ham UTC deb olinadi
+        return as_utc(value) if value is not None else None
+
+    @model_validator(mode="after")
+    def _check_range(self):
+        if self.created_after and self.created_before and self.created_after >= self.created_before:
+            raise ValueError("created_after created_before dan kichik bo'lishi kerak")
+        return self
+
+    @property
+    def descending(self) -> bool:
+        return self.order == SortOrder.desc
+
+    def fingerprint(self) -> str:
+        """Filtr va tartibning qisqa xeshi (kursorni shu parametrlarga bog'lash uchun)"""
+        return hashlib.blake2b(self.model_dump_json().encode("utf-8"), digest_size=8).hexdigest()
+
+    def conditions(self, model) -> List[Any]:
+        """WHERE shartlari (model ustunlari bo'yicha)"""
+        conditions = []
+        if self.created_after is not None:
+            conditions.append(model.created_at >= self.created_after)
+        if self.created_before is not None:
+            conditions.append(model.created_at < self.created_before)
+        return conditions
+
+    def order_by(self, model) -> List[Any]:
+        """ORDER BY ifodalari: (created_at, id) bir xil yo'nalishda"""
+        if self.descending:
+            return [model.created_at.desc(), model.id.desc()]
+        return [model.created_at.asc(), model.id.asc()]
+
+    def apply(self, query, model):
+        """Filtr va tartibni SELECT so'roviga qo'llash"""
+        return query.where(*self.conditions(model)).order_by(*self.order_by(model))
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Sahifalangan javob modeli"""
     status: str = "ok"
     items: List[T]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
     @classmethod
-    def create(cls, items: List[T], total: int, pagination: PaginationParams):
-        """Sahifalangan javob yaratish"""
-        pages = (total + pagination.page_size - 1) // pagination.page_size
+    def create(
+        cls,
+        items: List[T],
+        total: Optional[int],
+        pagination: PaginationParams,
+        next_cursor: Optional[str] = None
+    ):
+        """Sahifalangan javob yaratish (total=None - son hisoblanmagan)"""
+        pages = None
+        if total is not None:
+            pages = (total + pagination.page_size - 1) // pagination.page_size
         return cls(
             items=items,
             total=total,
             page=pagination.page,
             page_size=pagination.page_size,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
 
 
+class ConditionalHeaders(BaseModel):
+    """Shartli GET so'rovi sarlavhalari (If-None-Match / If-Modified-Since)"""
+    if_none_match: Optional[str] = None
+    if_modified_since: Optional[str] = None
+
+    def not_modified(self, etag: str, last_modified: Optional[datetime] = None) -> bool:
+        """304 qaytarish mumkinmi (If-None-Match bo'lsa, If-Modified-Since e'tiborga olinmaydi)"""
+        if self.if_none_match:
+            return etag_matches(self.if_none_match, etag)
+        if last_modified is not None:
+            return not_modified_since(self.if_modified_since, last_modified)
+        return False
+
+
 class BaseSchema(BaseModel):
     """Umumiy maydonlarga ega asosiy sxema"""
     id: uuid.UUID
@@ -0,0 +1,31 @@
+"""
+Testlar uchun umumiy sozlamalar
+Ilova vaqtinchalik SQLite bazasi va log fayllari bilan ishga tushiriladi
+"""
+
+import os
+import tempfile
+
+# Sozlamalar ilova import qilinishidan oldin o'rnatilishi kerak
+_TMP_DIR = tempfile.mkdtemp(prefix="echo-tests-")
+os.environ["APP_SQLITE_DB_PATH"] = os.path.join(_TMP_DIR, "test.db")
+os.environ["APP_LOG_FILE"] = os.path.join(_TMP_DIR, "logs", "app.log")
+os.environ["APP_ACCESS_LOG_FILE"] = os.path.join(_TMP_DIR, "logs", "access.log")
+os.environ["APP_DEBUG"] = "false"
+os.environ["APP_DB_USE_PGSQL"] = "false"
+
+import httpx
+import pytest
+
+from app import app
+from core.db import drop_tables
+
+
+@pytest.fixture
+async def client():
+    """Ilova lifespan'i ichidagi HTTP mijoz; har bir testdan keyin jadvallar tozalanadi"""
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+        await drop_tables()
@@ -0,0 +1,111 @@
+"""
+Yozuvlarni paketlab yozish navbati (WriteBatcher)
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from core.batching import WriteBatcher
+from core.settings import settings
+
+
+class Recorder:
+    """Flush chaqiruvlarini yozib boradigan soxta yozuvchi"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.batches: List[List[int]] = []
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, items: List[int]) -> List[int]:
+        self.batches.append(list(items))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("yozib bo'lmadi")
+        return [item * 10 for item in items]
+
+
+async def test_concurrent_submits_are_batched_in_order():
+    flush = Recorder()
+    batcher = WriteBatcher(flush, max_size=100, max_delay=0.05)
+    await batcher.start()
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+    await batcher.stop()
+
+    assert results == [i * 10 for i in range(20)]
+    assert flush.batches == [list(range(20))]
+
+
+async def test_batches_are_limited_by_max_size():
+    flush = Recorder()
+    batcher = WriteBatcher(flush, max_size=4, max_delay=0.05)
+    await batcher.start()
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+    await batcher.stop()
+
+    assert results == [i * 10 for i in range(10)]
+    assert [len(batch) for batch in flush.batches] == [4, 4, 2]
+
+
+async def test_flush_error_is_raised_for_every_caller():
+    batcher = WriteBatcher(Recorder(fail=True), max_size=10, max_delay=0.01)
+    await batcher.start()
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+    await batcher.stop()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_full_queue_writes_directly():
+    flush = Recorder(delay=0.02)
+    batcher = WriteBatcher(flush, max_size=1, max_delay=0, max_queue=1)
+    await batcher.start()
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+    await batcher.stop()
+
+    assert results == [i * 10 for i in range(5)]
+    # Navbat to'lganda elementlar alohida yoziladi - hammasi aynan bir marta
+    assert sorted(item for batch in flush.batches for item in batch) == list(range(5))
+
+
+async def test_stop_drains_pending_items():
+    flush = Recorder()
+    batcher = WriteBatcher(flush, max_size=100, max_delay=10)
+    await batcher.start()
+    pending = [asyncio.create_task(batcher.submit(i)) for i in range(5)]
+    await asyncio.sleep(0)
+    await batcher.stop()
+
+    assert [task.result() for task in pending] == [i * 10 for i in range(5)]
+    assert not batcher.running
+
+
+async def test_submit_requires_start():
+    batcher = WriteBatcher(Recorder())
+    with pytest.raises(RuntimeError):
+        await batcher.submit(1)
+
+
+@pytest.fixture
+def write_batching(monkeypatch):
+    """Ilova ECHO_WRITE_BATCHING yoqilgan holda ishga tushadi (client'dan oldin so'ralishi kerak)"""
+    monkeypatch.setattr(settings, "ECHO_WRITE_BATCHING", True)
+
+
+async def test_concurrent_creates_are_batched(write_batching, client):
+    from modules.echo.services import echo_service
+
+    assert echo_service.write_batcher is not None and echo_service.write_batcher.running
+    responses = await asyncio.gather(*(
+        client.post("/api/echo/", json={"message": f"xabar {i}"}) for i in range(20)
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    created = [response.json()["data"] for response in responses]
+    assert [item["message"] for item in created] == [f"xabar {i}" for i in range(20)]
+    assert len({item["id"] for item in created}) == 20
+
+    listed = (await client.get("/api/echo/", params={"page_size": 100})).json()
+    assert listed["total"] == 20
@@ -0,0 +1,193 @@
+"""
+Kesh qatlami (core.cache) va echo get_by_id uchun read-through kesh
+"""
+
+import json
+import pickle
+import uuid
+
+import pytest
+
+from core import cache as core_cache
+from core import db as core_db
+from core.cache import MISSING, MemoryCache, NullCache, RedisCache
+from core.settings import settings
+from modules.echo.models import Echo
+from modules.echo.schemas import EchoResponse
+from modules.echo.services import echo_service
+
+AUTH = {"Authorization": f"Bearer {settings.BEARER_TOKEN}"}
+
+
+class FakeRedis:
+    """redis.asyncio.Redis o'rinbosari: faqat RedisCache ishlatadigan usullar"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        assert isinstance(value, bytes)
+        self.data[key] = value
+        self.ttls[key] = px
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """core.cache dagi time.monotonic ni boshqariladigan soat bilan almashtirish"""
+    now = [1000.0]
+    monkeypatch.setattr(core_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+async def echo_cache():
+    await echo_service.cache.clear()
+    yield echo_service.cache
+    await echo_service.cache.clear()
+
+
+async def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache("test", max_size=2)
+    await cache.set("a", 1, ttl=60)
+    await cache.set("b", 2, ttl=60)
+    assert await cache.get("a") == 1  # "a" endi eng yangi
+    await cache.set("c", 3, ttl=60)
+
+    assert await cache.get("b") is MISSING
+    assert await cache.get("a") == 1 and await cache.get("c") == 3
+    assert cache.stats() == {
+        "backend": "MemoryCache", "hits": 3, "misses": 1, "evictions": 1, "size": 2, "max_size": 2,
+    }
+
+
+async def test_memory_cache_expires_entries(clock):
+    cache = MemoryCache("test")
+    await cache.set("a", None, ttl=5)
+    clock[0] += 4.9
+    assert await cache.get("a") is None
+    clock[0] += 0.2
+    assert await cache.get("a") is MISSING
+    assert cache.stats()["size"] == 0
+
+
+async def test_memory_cache_delete_and_clear():
+    cache = MemoryCache("test")
+    for key in "abc":
+        await cache.set(key, key, ttl=60)
+    await cache.delete("a", "missing")
+    assert await cache.get("a") is MISSING
+    await cache.clear()
+    assert await cache.get("b") is MISSING
+
+
+async def test_null_cache_stores_nothing():
+    cache = NullCache("test")
+    await cache.set("a", 1, ttl=60)
+    assert await cache.get("a") is MISSING
+
+
+async def test_redis_cache_stores_json():
+    client = FakeRedis()
+    cache = RedisCache("echo", client, model=EchoResponse)
+    item = EchoResponse(
+        id=uuid.uuid4(), message="salom", category=None, processed_message="molas",
+        created_at="2024-01-02T03:04:05", updated_at="2024-01-02T03:04:06",
+    )
+
+    await cache.set("item", item, ttl=1.5)
+    await cache.set("missing", None, ttl=5)
+    assert json.loads(client.data["echo:item"]) == json.loads(item.model_dump_json())
+    assert client.data["echo:missing"] == b"null"
+    assert client.ttls["echo:item"] == 1500
+
+    assert await cache.get("item") == item
+    assert await cache.get("missing") is None
+    assert await cache.get("absent") is MISSING
+
+
+async def test_redis_cache_without_model_and_bad_values():
+    client = FakeRedis()
+    cache = RedisCache("count", client)
+    await cache.set("total", {"value": 3}, ttl=1)
+    assert await cache.get("total") == {"value": 3}
+
+    # Eski (pickle) yoki buzilgan yozuv yuklanmaydi - keshda yo'q deb hisoblanadi
+    client.data["count:old"] = pickle.dumps({"value": 1})
+    client.data["count:bad"] = b"{buzilgan"
+    assert await cache.get("old") is MISSING
+    assert await cache.get("bad") is MISSING
+    assert cache.misses == 2
+
+
+async def test_redis_cache_delete_and_clear_use_prefix():
+    client = FakeRedis()
+    cache = RedisCache("echo", client)
+    await cache.set("a", 1, ttl=1)
+    await cache.set("b", 2, ttl=1)
+    client.data["other:a"] = b"1"
+
+    await cache.delete("a")
+    assert set(client.data) == {"echo:b", "other:a"}
+    await cache.clear()
+    assert set(client.data) == {"other:a"}
+
+
+async def test_get_caches_found_items(echo_cache, client):
+    created = (await client.post("/api/echo/", json={"message": "salom"})).json()["data"]
+    assert (await client.get(f"/api/echo/{created['id']}")).status_code == 200
+    hits = echo_cache.hits
+    assert (await client.get(f"/api/echo/{created['id']}")).json()["data"] == created
+    assert echo_cache.hits == hits + 1
+
+
+async def test_misses_are_cached(echo_cache, client):
+    item_id = uuid.uuid4()
+    assert (await client.get(f"/api/echo/{item_id}")).status_code == 404
+    assert await echo_cache.get(item_id.hex) is None
+
+    # Servisni chetlab yozilgan yozuv manfiy TTL davomida ko'rinmaydi
+    async with core_db.engine.begin() as conn:
+        await conn.execute(Echo.__table__.insert().values(
+            id=item_id, message="salom", processed_message="molas"
+        ))
+    assert (await client.get(f"/api/echo/{item_id}")).status_code == 404
+    await echo_cache.delete(item_id.hex)
+    assert (await client.get(f"/api/echo/{item_id}")).status_code == 200
+
+
+async def test_create_invalidates_cached_ids(echo_cache, client, monkeypatch):
+    deleted = []
+    delete = echo_cache.delete
+
+    async def record_delete(*keys):
+        deleted.extend(keys)
+        await delete(*keys)
+
+    monkeypatch.setattr(echo_cache, "delete", record_delete)
+    single = (await client.post("/api/echo/", json={"message": "salom"})).json()["data"]
+    bulk = (await client.post("/api/echo/bulk", json={"items": [{"message": "a"}, {"message": "b"}]})).json()
+    ids = [single["id"], *(item["id"] for item in bulk["data"]["items"])]
+    assert deleted == [uuid.UUID(item_id).hex for item_id in ids]
+
+
+async def test_get_after_delete_returns_404(echo_cache, client):
+    created = (await client.post("/api/echo/", json={"message": "salom"})).json()["data"]
+    assert (await client.get(f"/api/echo/{created['id']}")).status_code == 200
+    assert await echo_cache.get(uuid.UUID(created["id"]).hex) is not MISSING
+
+    assert (await client.delete(f"/api/echo/{created['id']}", headers=AUTH)).status_code == 200
+    assert (await client.get(f"/api/echo/{created['id']}")).status_code == 404
@@ -0,0 +1,123 @@
+"""
+Javoblarni siqish middleware'i
+"""
+
+import zlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from middleware.compression import CompressionMiddleware
+
+BODY = b"echo " * 1000
+
+
+async def large(request):
+    return PlainTextResponse(BODY)
+
+
+async def small(request):
+    return PlainTextResponse("kichik")
+
+
+async def encoded(request):
+    return Response(zlib.compress(BODY), media_type="text/plain", headers={"Content-Encoding": "deflate"})
+
+
+async def image(request):
+    return Response(BODY, media_type="image/png")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(10):
+            yield BODY
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+async def small_stream(request):
+    async def chunks():
+        yield b"a"
+        yield b"b"
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def make_client(**options) -> httpx.AsyncClient:
+    app = Starlette(routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/encoded", encoded),
+        Route("/image", image),
+        Route("/stream", stream),
+        Route("/small-stream", small_stream),
+    ])
+    app.add_middleware(CompressionMiddleware, **options)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip", "gzip"),
+    ("deflate", "deflate"),
+    ("gzip;q=0, deflate", "deflate"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate(accept, expected):
+    middleware = CompressionMiddleware(app=None)
+    assert middleware.negotiate(accept) == expected
+
+
+def test_negotiate_prefers_first_available_encoder():
+    middleware = CompressionMiddleware(app=None)
+    assert middleware.negotiate("*") == next(iter(middleware.encoders))
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+async def test_large_body_is_compressed(encoding):
+    async with make_client() as client:
+        response = await client.get("/large", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == BODY
+
+
+async def test_offloaded_body_is_compressed():
+    async with make_client(offload_size=1024) as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize("path", ["/small", "/image", "/small-stream"])
+async def test_body_is_left_alone(path):
+    async with make_client() as client:
+        response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+async def test_already_encoded_body_is_not_recompressed():
+    async with make_client() as client:
+        response = await client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "deflate"
+    assert response.content == BODY
+
+
+async def test_without_accept_encoding_body_is_raw():
+    async with make_client() as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+async def test_streaming_response_is_compressed_incrementally():
+    async with make_client() as client:
+        response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == BODY * 10
@@ -0,0 +1,85 @@
+"""
+ETag / If-None-Match / If-Modified-Since
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.settings import settings
+from shared.schemas.common import ConditionalHeaders
+from utils.helpers import etag_matches, http_date, make_etag, not_modified_since
+
+AUTH = {"Authorization": f"Bearer {settings.BEARER_TOKEN}"}
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag("a", 1)
+    assert etag.startswith('W/"')
+    assert etag == make_etag("a", 1)
+    assert etag != make_etag("a", 2)
+
+
+@pytest.mark.parametrize("header", [
+    'W/"x"',
+    '"x"',
+    '"y", W/"x"',
+    " * ",
+])
+def test_etag_matches(header):
+    assert etag_matches(header, 'W/"x"')
+
+
+@pytest.mark.parametrize("header", [None, "", '"y"', 'W/"xx"'])
+def test_etag_does_not_match(header):
+    assert not etag_matches(header, 'W/"x"')
+
+
+def test_not_modified_since_uses_second_precision():
+    modified = datetime(2024, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    assert not_modified_since(http_date(modified), modified)
+    assert not not_modified_since(http_date(modified - timedelta(seconds=1)), modified)
+    assert not not_modified_since("sana emas", modified)
+
+
+def test_if_none_match_takes_precedence():
+    modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    headers = ConditionalHeaders(if_none_match='"other"', if_modified_since=http_date(modified))
+    assert not headers.not_modified('W/"x"', modified)
+
+
+async def test_get_by_id_returns_304(client):
+    created = await client.post("/api/echo/", json={"message": "salom"})
+    item_id = created.json()["data"]["id"]
+
+    response = await client.get(f"/api/echo/{item_id}")
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"]
+
+    cached = await client.get(f"/api/echo/{item_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert not cached.content
+
+    since = await client.get(
+        f"/api/echo/{item_id}", headers={"If-Modified-Since": response.headers["last-modified"]}
+    )
+    assert since.status_code == 304
+
+
+async def test_list_etag_changes_after_delete(client):
+    items = [{"message": f"xabar {i}"} for i in range(3)]
+    await client.post("/api/echo/bulk", json={"items": items})
+
+    page = await client.get("/api/echo/", params={"page_size": 2})
+    etag = page.headers["etag"]
+    assert "last-modified" not in page.headers
+    assert (await client.get(
+        "/api/echo/", params={"page_size": 2}, headers={"If-None-Match": etag}
+    )).status_code == 304
+
+    item_id = page.json()["items"][0]["id"]
+    assert (await client.delete(f"/api/echo/{item_id}", headers=AUTH)).status_code == 200
+    changed = await client.get("/api/echo/", params={"page_size": 2}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
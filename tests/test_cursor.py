@@ -0,0 +1,71 @@
+"""
+Imzolangan kursorlar va keyset sahifalash
+"""
+
+import pytest
+
+from utils.helpers import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    values = ["2024-01-01T00:00:00", "0f" * 16, "abc"]
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(["a" * 100, 1, None])
+    assert "=" not in cursor
+    assert all(c.isalnum() or c in "-_." for c in cursor)
+
+
+def test_tampered_payload_is_rejected():
+    _, signature = encode_cursor(["2024-01-01T00:00:00", "a"]).split(".")
+    forged, _ = encode_cursor(["2030-01-01T00:00:00", "a"]).split(".")
+    with pytest.raises(ValueError):
+        decode_cursor(f"{forged}.{signature}")
+
+
+def test_tampered_signature_is_rejected():
+    payload, signature = encode_cursor([1]).split(".")
+    with pytest.raises(ValueError):
+        decode_cursor(f"{payload}.{signature[::-1]}")
+
+
+@pytest.mark.parametrize("cursor", ["", "no-dot", "!!!.???", "a.b.c"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+async def test_cursor_pages_cover_all_items_once(client):
+    for i in range(7):
+        assert (await client.post("/api/echo/", json={"message": f"xabar {i}"})).status_code == 200
+
+    seen = []
+    params = {"page_size": 3}
+    while True:
+        page = (await client.get("/api/echo/", params=params)).json()
+        seen.extend(item["id"] for item in page["items"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == 7
+    offset_page = (await client.get("/api/echo/", params={"page_size": 7})).json()
+    assert seen == [item["id"] for item in offset_page["items"]]
+
+
+async def test_invalid_cursor_returns_400(client):
+    response = await client.get("/api/echo/", params={"cursor": "buzilgan.kursor"})
+    assert response.status_code == 400
+
+
+async def test_cursor_is_bound_to_filters(client):
+    items = [{"message": f"xabar {i}", "category": "demo"} for i in range(3)]
+    await client.post("/api/echo/bulk", json={"items": items})
+    page = (await client.get("/api/echo/", params={"page_size": 1, "category": "demo"})).json()
+
+    response = await client.get(
+        "/api/echo/", params={"page_size": 1, "order": "asc", "cursor": page["next_cursor"]}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,68 @@
+"""
+Echo yaratish: bitta va ommaviy (POST /api/echo/bulk)
+"""
+
+from core.settings import settings
+
+
+async def test_bulk_create_reports_invalid_items(client):
+    items = [
+        {"message": "birinchi", "category": "demo"},
+        {"message": ""},
+        {"category": "demo"},
+        {"message": "ikkinchi"},
+        {"message": "x" * 1001},
+    ]
+    response = await client.post("/api/echo/bulk", json={"items": items})
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+
+    assert [item["message"] for item in data["items"]] == ["birinchi", "ikkinchi"]
+    assert all(item["processed_message"] == item["message"][::-1] for item in data["items"])
+    assert [error["index"] for error in data["errors"]] == [1, 2, 4]
+    assert all(error["errors"] for error in data["errors"])
+
+    listed = (await client.get("/api/echo/")).json()
+    assert listed["total"] == 2
+
+
+async def test_bulk_create_with_only_invalid_items(client):
+    response = await client.post("/api/echo/bulk", json={"items": [{"message": ""}]})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["items"] == []
+    assert [error["index"] for error in data["errors"]] == [0]
+
+
+async def test_bulk_create_limits(client):
+    assert (await client.post("/api/echo/bulk", json={"items": []})).status_code == 422
+    too_many = [{"message": "x"}] * (settings.ECHO_BULK_MAX_ITEMS + 1)
+    assert (await client.post("/api/echo/bulk", json={"items": too_many})).status_code == 422
+
+
+async def test_create_is_a_single_statement(client):
+    from sqlalchemy import event
+    from core.db import engine
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = await client.post("/api/echo/", json={"message": "salom", "category": "demo"})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert data["processed_message"] == "molas"
+    assert data["created_at"] and data["updated_at"]
+    # Faqat INSERT: refresh uchun qo'shimcha SELECT yo'q
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("INSERT")
+
+    # Javob bazadan qayta o'qilgan yozuv bilan bir xil (vaqtlar ham)
+    fetched = (await client.get(f"/api/echo/{data['id']}")).json()["data"]
+    assert fetched == data
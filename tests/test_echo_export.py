@@ -0,0 +1,61 @@
+"""
+Echo eksporti (GET /api/echo/export): NDJSON va CSV, bir nechta keyset to'plami
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from core.settings import settings
+from modules.echo.funcs import EXPORT_FIELDS
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    # 7 ta yozuv 3 tadan: to'liq, to'liq va qisman to'plam
+    monkeypatch.setattr(settings, "ECHO_EXPORT_BATCH_SIZE", 3)
+
+
+async def create_items(client, count: int = 7):
+    items = [{"message": f"xabar {i}", "category": "demo" if i % 2 else "test"} for i in range(count)]
+    response = await client.post("/api/echo/bulk", json={"items": items})
+    assert response.status_code == 200, response.text
+    return [item["id"] for item in response.json()["data"]["items"]]
+
+
+async def test_export_ndjson_across_batches(small_batches, client):
+    await create_items(client)
+    listed = (await client.get("/api/echo/", params={"page_size": 100})).json()["items"]
+
+    response = await client.get("/api/echo/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == listed
+
+
+async def test_export_csv_across_batches(small_batches, client):
+    ids = await create_items(client)
+
+    response = await client.get("/api/echo/export", params={"format": "csv", "order": "asc"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert tuple(rows[0]) == EXPORT_FIELDS
+    assert [row[0] for row in rows[1:]] == ids
+
+
+async def test_export_applies_filters(small_batches, client):
+    await create_items(client)
+    response = await client.get("/api/echo/export", params={"category": "demo"})
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert len(exported) == 3
+    assert {item["category"] for item in exported} == {"demo"}
+
+
+async def test_export_csv_without_rows_has_header(client):
+    response = await client.get("/api/echo/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert list(csv.reader(io.StringIO(response.text))) == [list(EXPORT_FIELDS)]
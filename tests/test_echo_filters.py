@@ -0,0 +1,72 @@
+"""
+Echo ro'yxati filtrlari va tartiblash (EchoFilterParams)
+"""
+
+import pytest
+
+from core.settings import settings
+
+AUTH = {"Authorization": f"Bearer {settings.BEARER_TOKEN}"}
+
+
+async def create_items(client):
+    items = [
+        {"message": "birinchi", "category": "demo"},
+        {"message": "ikkinchi", "category": "test"},
+        {"message": "uchinchi", "category": "demo"},
+    ]
+    response = await client.post("/api/echo/bulk", json={"items": items})
+    assert response.status_code == 200, response.text
+    protected = await client.post("/api/echo/protected", json={"message": "himoyalangan"}, headers=AUTH)
+    assert protected.status_code == 200, protected.text
+
+
+def messages(response):
+    assert response.status_code == 200, response.text
+    return [item["message"] for item in response.json()["items"]]
+
+
+async def test_category_filter(client):
+    await create_items(client)
+    response = await client.get("/api/echo/", params={"category": "DEMO"})
+    assert sorted(messages(response)) == ["birinchi", "uchinchi"]
+    assert response.json()["total"] == 2
+
+
+async def test_is_protected_filter(client):
+    await create_items(client)
+    assert messages(await client.get("/api/echo/", params={"is_protected": "true"})) == ["himoyalangan"]
+    response = await client.get("/api/echo/", params={"is_protected": "false"})
+    assert response.json()["total"] == 3
+
+
+async def test_order_asc_reverses_desc(client):
+    await create_items(client)
+    desc = messages(await client.get("/api/echo/"))
+    asc = messages(await client.get("/api/echo/", params={"order": "asc"}))
+    assert asc == desc[::-1]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"category": "unknown"},
+        {"order": "sideways"},
+        {"created_after": "2024-01-02T00:00:00", "created_before": "2024-01-01T00:00:00"},
+        {"page": 0},
+        {"page_size": 1000},
+    ],
+)
+async def test_invalid_params_return_422(client, params):
+    response = await client.get("/api/echo/", params=params)
+    assert response.status_code == 422, response.text
+
+
+async def test_category_is_stored_in_lowercase(client):
+    created = await client.post("/api/echo/", json={"message": "salom", "category": "Demo"})
+    assert created.json()["data"]["category"] == "demo"
+    bulk = await client.post("/api/echo/bulk", json={"items": [{"message": "dunyo", "category": "DEMO"}]})
+    assert bulk.json()["data"]["items"][0]["category"] == "demo"
+
+    response = await client.get("/api/echo/", params={"category": "demo"})
+    assert sorted(messages(response)) == ["dunyo", "salom"]
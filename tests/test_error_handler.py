@@ -0,0 +1,89 @@
+"""
+Global xatoliklar middleware'i (ErrorHandlerMiddleware)
+"""
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from core.settings import settings
+from middleware.error_handler import ErrorHandlerMiddleware
+
+
+async def crash(request):
+    raise RuntimeError("nimadir buzildi")
+
+
+async def stream_then_crash(request):
+    async def body():
+        yield b"boshlandi"
+        raise RuntimeError("oqim buzildi")
+    return StreamingResponse(body())
+
+
+async def raw_http_exception(scope, receive, send):
+    raise HTTPException(status_code=418, detail="Choynakman")
+
+
+def make_client(app):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+# Ilovadagidek: middleware Starlette'ning ServerErrorMiddleware'i ichida
+APP = Starlette(
+    routes=[Route("/crash", crash), Route("/stream", stream_then_crash)],
+    middleware=[Middleware(ErrorHandlerMiddleware)],
+)
+
+
+async def test_unhandled_exception_returns_json_error():
+    async with make_client(APP) as client:
+        response = await client.get("/crash")
+    assert response.status_code == 500
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"status": "error", "message": "Ichki server xatosi", "error_code": 500}
+
+
+async def test_debug_mode_adds_details(monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+    async with make_client(APP) as client:
+        response = await client.get("/crash")
+    assert response.json() == {
+        "status": "error",
+        "message": "Ichki server xatosi",
+        "error_code": 500,
+        "details": "nimadir buzildi",
+        "type": "RuntimeError",
+    }
+
+
+async def test_http_exception_uses_same_shape():
+    async with make_client(ErrorHandlerMiddleware(raw_http_exception)) as client:
+        response = await client.get("/")
+    assert response.status_code == 418
+    assert response.json() == {"status": "error", "message": "Choynakman", "error_code": 418}
+
+
+async def test_error_after_response_started_is_reraised():
+    transport = httpx.ASGITransport(app=APP)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with pytest.raises(RuntimeError, match="oqim buzildi"):
+            await client.get("/stream")
+
+
+
+async def test_app_unhandled_exception_returns_json_error(client, monkeypatch):
+    async def broken():
+        raise RuntimeError("baza javob bermadi")
+
+    monkeypatch.setattr("core.db.check_database_connection", broken)
+    response = await client.get("/health", headers={"X-Request-ID": "xato-1"})
+    assert response.status_code == 500
+    assert response.json() == {"status": "error", "message": "Ichki server xatosi", "error_code": 500}
+    # Tashqi middleware'lar javobni odatdagidek oladi
+    assert response.headers["x-request-id"] == "xato-1"
@@ -0,0 +1,47 @@
+"""
+Parallel o'qishlar (gather_reads, DB_PARALLEL_READS)
+"""
+
+import pytest
+from sqlalchemy import text
+
+from core.db import SessionLocal, gather_reads
+from core.settings import settings
+
+
+@pytest.fixture(params=[True, False], ids=["parallel", "sequential"])
+def parallel_reads(request, monkeypatch):
+    monkeypatch.setattr(settings, "DB_PARALLEL_READS", request.param)
+    return request.param
+
+
+async def test_reads_use_own_sessions_only_in_parallel(parallel_reads, client):
+    async def read(session):
+        return session, (await session.execute(text("SELECT 1"))).scalar()
+
+    async with SessionLocal() as db:
+        results = await gather_reads(db, read, read)
+
+    assert [value for _, value in results] == [1, 1]
+    sessions = [session for session, _ in results]
+    if parallel_reads:
+        assert db not in sessions and sessions[0] is not sessions[1]
+    else:
+        assert sessions == [db, db]
+
+
+async def test_parallel_and_sequential_lists_match(client, monkeypatch):
+    items = [{"message": f"xabar {i}", "category": "demo" if i % 2 else None} for i in range(7)]
+    assert (await client.post("/api/echo/bulk", json={"items": items})).status_code == 200
+
+    pages = {}
+    for parallel in (True, False):
+        monkeypatch.setattr(settings, "DB_PARALLEL_READS", parallel)
+        pages[parallel] = [
+            (await client.get("/api/echo/", params=params)).json()
+            for params in ({"page_size": 3}, {"page_size": 3, "page": 3}, {"category": "demo"})
+        ]
+
+    assert pages[True] == pages[False]
+    assert [page["total"] for page in pages[True]] == [7, 7, 3]
+    assert len(pages[True][0]["items"]) == 3
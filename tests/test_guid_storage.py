@@ -0,0 +1,94 @@
+"""
+GUID saqlash formati: CHAR(32) hex <-> 16 baytli BLOB (migrate_guid_storage)
+GUID turi formatni import paytida DB_UUID_STORAGE dan oladi, shuning uchun
+binary rejimdagi ilova alohida jarayonda ishga tushiriladi
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import uuid
+from pathlib import Path
+
+from core import db as core_db
+from core.db import GUID, migrate_guid_storage
+from modules.echo.services import echo_service
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Binary rejimdagi ilova: berilgan id'larni o'qiydi va bitta yangi echo yaratadi
+BINARY_APP = textwrap.dedent("""
+    import asyncio
+    import json
+    import sys
+
+    import httpx
+
+    from app import app
+
+
+    async def main():
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                fetched = [
+                    (await client.get(f"/api/echo/{item_id}")).json()["data"]
+                    for item_id in json.loads(sys.argv[1])
+                ]
+                created = (await client.post("/api/echo/", json={"message": "binary"})).json()["data"]
+        print(json.dumps({"fetched": fetched, "created": created}))
+
+
+    asyncio.run(main())
+""")
+
+
+def run_binary_app(ids):
+    env = {**os.environ, "APP_DB_UUID_STORAGE": "binary"}
+    result = subprocess.run(
+        [sys.executable, "-c", BINARY_APP, json.dumps(ids)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-3000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+async def stored_types():
+    async with core_db.engine.connect() as conn:
+        result = await conn.exec_driver_sql("SELECT DISTINCT typeof(id) FROM echo_items")
+        return {row[0] for row in result}
+
+
+def test_guid_bind_and_result_values():
+    value = uuid.uuid4()
+    dialect = core_db.engine.dialect
+    assert GUID(binary=False).process_bind_param(value, dialect) == value.hex
+    assert GUID(binary=True).process_bind_param(str(value), dialect) == value.bytes
+    assert GUID().process_result_value(value.bytes, dialect) == value
+    assert GUID().process_result_value(value.hex, dialect) == value
+
+
+async def test_migrate_to_binary_and_back(client):
+    items = [{"message": f"xabar {i}"} for i in range(5)]
+    created = (await client.post("/api/echo/bulk", json={"items": items})).json()["data"]["items"]
+    assert await stored_types() == {"text"}
+
+    assert await migrate_guid_storage(to_binary=True, batch_size=2) == 5
+    assert await stored_types() == {"blob"}
+    # Qayta ishga tushirish hech narsani o'zgartirmaydi
+    assert await migrate_guid_storage(to_binary=True) == 0
+
+    binary = run_binary_app([item["id"] for item in created])
+    assert binary["fetched"] == created
+    assert await stored_types() == {"blob"}
+
+    assert await migrate_guid_storage(to_binary=False, batch_size=2) == 6
+    assert await stored_types() == {"text"}
+
+    await echo_service.cache.clear()
+    for item in [*created, binary["created"]]:
+        response = await client.get(f"/api/echo/{item['id']}")
+        assert response.status_code == 200, response.text
+        assert response.json()["data"] == item
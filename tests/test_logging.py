@@ -0,0 +1,168 @@
+"""
+So'rov loglari (X-Request-ID, access log) va navbatli log yozish (LOG_ASYNC)
+"""
+
+import json
+import threading
+import uuid
+
+import pytest
+from loguru import logger
+
+from core import logger as core_logger
+from core.logger import QueuedSink, setup_logging, shutdown_logging
+from core.settings import settings
+
+
+@pytest.fixture
+def records():
+    """Test davomida yozilgan log yozuvlari (record dict'lari)"""
+    captured = []
+    handler_id = logger.add(lambda message: captured.append(message.record), level="DEBUG")
+    yield captured
+    logger.remove(handler_id)
+
+
+def assert_generated(request_id: str) -> None:
+    assert uuid.UUID(hex=request_id).version == 4
+    assert len(request_id) == 32
+
+
+async def test_valid_request_id_is_echoed(records, client):
+    request_id = "req-1.2:abc_DEF"
+    response = await client.get("/api/echo/", headers={"X-Request-ID": request_id})
+    assert response.headers["x-request-id"] == request_id
+
+    # Handler ichidagi yozuvlar ham shu ID bilan
+    tagged = [record for record in records if record["extra"].get("request_id") == request_id]
+    assert any(record["name"] == "modules.echo.services" for record in tagged)
+    assert any(record["name"] == "middleware.logging" for record in tagged)
+
+
+@pytest.mark.parametrize("request_id", ["bo'sh joy bor", "x" * 129, "yo'l/nomi", "a\"b"])
+async def test_invalid_request_id_is_replaced(client, request_id):
+    response = await client.get("/api/echo/", headers={"X-Request-ID": request_id})
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] != request_id
+    assert_generated(response.headers["x-request-id"])
+
+
+async def test_missing_request_id_is_generated(client):
+    first = (await client.get("/api/echo/")).headers["x-request-id"]
+    second = (await client.get("/api/echo/")).headers["x-request-id"]
+    assert_generated(first)
+    assert first != second
+
+
+async def test_json_access_log_line(records, client, monkeypatch):
+    monkeypatch.setattr(settings, "ACCESS_LOG_FORMAT", "json")
+    await client.get("/api/echo/", params={"page": 2}, headers={"X-Request-ID": "json-1"})
+    await client.get("/api/echo/yoq-id")
+
+    access = [json.loads(record["message"]) for record in records if record["extra"].get("access")]
+    assert [(line["path"], line["status"]) for line in access] == [
+        ("/api/echo/", 200), ("/api/echo/yoq-id", 404)
+    ]
+    assert access[0]["request_id"] == "json-1"
+    assert access[0]["method"] == "GET" and access[0]["duration_ms"] >= 0
+
+
+class GatedTarget:
+    """QueuedSink uchun sekin sink o'rinbosari: gate ochilguncha yozmaydi"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.messages = []
+        self.warnings = []
+        self.completed = False
+
+    def patch(self, patcher):
+        return self
+
+    def log(self, level, message):
+        self.gate.wait(5)
+        self.messages.append(message)
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+    def complete(self):
+        self.completed = True
+
+
+@pytest.fixture
+def queued(request):
+    """Test logger'iga ulangan QueuedSink: (bound_logger, sink, target)"""
+    policy, maxsize = request.param
+    target = GatedTarget()
+    sink = QueuedSink(target, maxsize=maxsize, policy=policy)
+    handler_id = logger.add(sink, format="{message}", filter=lambda r: "queue_test" in r["extra"])
+    yield logger.bind(queue_test=True), sink, target
+    logger.remove(handler_id)
+    target.gate.set()
+    sink.stop()
+
+
+@pytest.mark.parametrize("queued", [("drop", 2)], indirect=True)
+def test_drop_policy_counts_and_reports_dropped(queued):
+    log, sink, target = queued
+    for i in range(10):
+        log.info(f"xabar {i}")
+    # Worker birinchi yozuvda gate'da turibdi, navbatda 2 ta joy
+    assert sink.dropped >= 7
+
+    target.gate.set()
+    sink.stop()
+    assert len(target.messages) == 10 - sink.dropped
+    assert target.messages[0] == "xabar 0"
+    assert target.warnings == [f"Log navbati to'lgan: {sink.dropped} ta yozuv tashlab yuborildi"]
+    assert target.completed
+
+
+@pytest.mark.parametrize("queued", [("block", 2)], indirect=True)
+def test_block_policy_waits_for_space(queued):
+    log, sink, target = queued
+    writer = threading.Thread(target=lambda: [log.info(f"xabar {i}") for i in range(10)])
+    writer.start()
+    writer.join(0.2)
+    # Navbat to'la - yozuvchi joy bo'shashini kutmoqda
+    assert writer.is_alive()
+
+    target.gate.set()
+    writer.join(5)
+    sink.stop()
+    assert target.messages == [f"xabar {i}" for i in range(10)]
+    assert sink.dropped == 0 and target.warnings == []
+
+
+@pytest.fixture
+def async_logging(tmp_path, monkeypatch):
+    """LOG_ASYNC rejimidagi loglash vaqtinchalik fayllarga; testdan keyin asl sozlama tiklanadi"""
+    log_file = tmp_path / "app.log"
+    monkeypatch.setattr(settings, "LOG_ASYNC", True)
+    monkeypatch.setattr(settings, "LOG_FILE", str(log_file))
+    monkeypatch.setattr(settings, "ACCESS_LOG_FILE", str(tmp_path / "access.log"))
+    yield log_file
+    shutdown_logging()
+    monkeypatch.undo()
+    setup_logging()
+
+
+@pytest.mark.parametrize("policy", ["drop", "block"])
+def test_shutdown_logging_drains_queue(async_logging, monkeypatch, policy):
+    monkeypatch.setattr(settings, "LOG_QUEUE_POLICY", policy)
+    setup_logging()
+    sink = core_logger._queued_sink
+    assert sink is not None and sink.policy == policy
+
+    for i in range(500):
+        logger.info(f"navbat {policy} {i}")
+    shutdown_logging()
+    assert core_logger._queued_sink is None and not sink._thread.is_alive()
+
+    written = async_logging.read_text(encoding="utf-8")
+    assert sum(f"navbat {policy} " in line for line in written.splitlines()) == 500 - sink.dropped
+    assert sink.dropped == 0
+    # To'xtatilgandan keyin yozuvlar to'g'ridan-to'g'ri sink'larga boradi
+    logger.info("navbatdan keyin")
+    assert "navbatdan keyin" in async_logging.read_text(encoding="utf-8")
@@ -0,0 +1,89 @@
+"""
+Prometheus metrikalari (/metrics, core.metrics)
+"""
+
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from core import db as core_db
+from core.metrics import Counter, Gauge, Histogram, Registry
+
+
+def sample(body: str, name: str, **labels) -> float:
+    """Metrika qiymatini matn formatidan olish (label'lar to'liq mos kelishi kerak)"""
+    expected = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = rf"^{re.escape(name)}(?:\{{(.*)\}})? (\S+)$"
+    for line in body.splitlines():
+        match = re.match(pattern, line)
+        if match and (match.group(1) or "") == expected:
+            return float(match.group(2))
+    raise AssertionError(f"{name}{{{expected}}} topilmadi")
+
+
+def test_registry_renders_text_format():
+    registry = Registry()
+    counter = registry.register(Counter("hits_total", "Hits", ("route",)))
+    gauge = registry.register(Gauge("pool_size", "Size", function=lambda: 5))
+    histogram = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)))
+    counter.inc(('/a"b',), 2)
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(3)
+
+    body = registry.render()
+    assert "# TYPE hits_total counter" in body
+    assert sample(body, "hits_total", route='/a\\"b') == 2
+    assert sample(body, "pool_size") == 5
+    assert sample(body, "latency_seconds_bucket", le="0.1") == 1
+    assert sample(body, "latency_seconds_bucket", le="1.0") == 2
+    assert sample(body, "latency_seconds_bucket", le="+Inf") == 3
+    assert sample(body, "latency_seconds_count") == 3
+    assert gauge.function() == 5
+
+
+async def test_metrics_endpoint_reports_routes_and_queries(client):
+    # Metrikalar jarayon bo'yicha umumiy - oldingi testlardagi qiymatlardan farq tekshiriladi
+    def value(body, name, **labels):
+        try:
+            return sample(body, name, **labels)
+        except AssertionError:
+            return 0
+
+    def delta(name, **labels):
+        return value(after, name, **labels) - value(before, name, **labels)
+
+    before = (await client.get("/metrics")).text
+    created = (await client.post("/api/echo/", json={"message": "salom"})).json()["data"]
+    for _ in range(2):
+        await client.get(f"/api/echo/{created['id']}")
+    await client.get("/yoq-sahifa")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+
+    # Label - marshrut shabloni, aniq URL emas
+    assert delta("http_requests_total", method="GET", route="/api/echo/{item_id}", status="200") == 2
+    assert delta("http_requests_total", method="POST", route="/api/echo/", status="200") == 1
+    assert delta("http_requests_total", method="GET", route="<unmatched>", status="404") == 1
+    assert delta("http_request_duration_seconds_count", method="POST", route="/api/echo/", status="200") == 1
+    assert created["id"] not in after
+
+    assert delta("db_query_duration_seconds_count", operation="INSERT") >= 1
+    assert delta("db_query_duration_seconds_count", operation="SELECT") >= 1
+    assert 'db_query_duration_seconds_bucket{operation="SELECT",le="+Inf"}' in after
+    assert sample(after, "db_pool_size") >= 1
+
+
+async def test_failed_query_does_not_leak_start_times(client):
+    async with core_db.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM jadval_yoq"))
+        await conn.execute(text("SELECT 1"))
+        # Har bir boshlangan so'rov yopilgan: muvaffaqiyatli yoki xato bilan
+        assert conn.sync_connection.info.get("query_start") == []
@@ -0,0 +1,80 @@
+"""
+NDJSON oqimini qatorlarga ajratish va import endpoint'i
+"""
+
+import json
+from typing import List
+
+import pytest
+
+from core.settings import settings
+from modules.echo.funcs import ndjson_lines
+
+AUTH = {"Authorization": f"Bearer {settings.BEARER_TOKEN}"}
+
+
+async def chunked(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(*chunks: bytes, max_line_size: int = 100) -> List[tuple]:
+    return [line async for line in ndjson_lines(chunked(*chunks), max_line_size)]
+
+
+async def test_lines_split_across_chunks():
+    assert await collect(b'{"a":', b'1}\n{"b"', b":2}\n") == [(1, b'{"a":1}'), (2, b'{"b":2}')]
+
+
+async def test_trailing_line_without_newline():
+    assert await collect(b"x\ny") == [(1, b"x"), (2, b"y")]
+
+
+async def test_blank_lines_are_skipped_but_counted():
+    assert await collect(b"x\n\n  \ny\n") == [(1, b"x"), (4, b"y")]
+
+
+async def test_empty_stream():
+    assert await collect() == []
+    assert await collect(b"") == []
+
+
+@pytest.mark.parametrize("chunks", [
+    # Qator bitta bo'lakda to'liq
+    (b"ok\n" + b"x" * 11 + b"\nok\n",),
+    # Uzun qator bir necha bo'lakka bo'lingan - bufer chegaradan oshadi
+    (b"ok\n" + b"x" * 6, b"x" * 5, b"\nok\n"),
+])
+async def test_oversized_line_is_reported(chunks):
+    assert await collect(*chunks, max_line_size=10) == [(1, b"ok"), (2, None), (3, b"ok")]
+
+
+async def test_oversized_trailing_line():
+    assert await collect(b"ok\n" + b"x" * 6, b"x" * 6, max_line_size=10) == [(1, b"ok"), (2, None)]
+
+
+async def test_line_of_exact_limit_is_kept():
+    assert await collect(b"x" * 10 + b"\n", max_line_size=10) == [(1, b"x" * 10)]
+
+
+async def test_import_reports_bad_lines(client):
+    body = "\n".join([
+        json.dumps({"message": "birinchi", "category": "demo"}),
+        "json emas",
+        json.dumps({"message": ""}),
+        json.dumps({"message": "ikkinchi"}),
+    ])
+    response = await client.post("/api/echo/import", content=body.encode(), headers=AUTH)
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert data["imported"] == 2
+    assert data["failed"] == 2
+    assert [error["line"] for error in data["errors"]] == [2, 3]
+
+    listed = (await client.get("/api/echo/")).json()
+    assert sorted(item["message"] for item in listed["items"]) == ["birinchi", "ikkinchi"]
+
+
+async def test_import_requires_token(client):
+    response = await client.post("/api/echo/import", content=b"{}")
+    assert response.status_code == 403
@@ -0,0 +1,127 @@
+"""
+Ro'yxatlarning umumiy sonini hisoblash strategiyalari (core.pagination)
+"""
+
+import pytest
+
+from core import db as core_db
+from core.pagination import (
+    CachedCount, EstimatedCount, ExactCount, get_count_strategy
+)
+from core.settings import settings
+from modules.echo.models import Echo
+from modules.echo.services import echo_service
+
+AUTH = {"Authorization": f"Bearer {settings.BEARER_TOKEN}"}
+TABLE = Echo.__tablename__
+
+
+@pytest.fixture
+def counter(monkeypatch):
+    """echo_service uchun strategiyani almashtirish: counter(CachedCount(...))"""
+    def use(strategy):
+        monkeypatch.setattr(echo_service, "counter", strategy)
+        return strategy
+    return use
+
+
+async def create(client, count, **fields):
+    items = [{"message": f"xabar {i}", **fields} for i in range(count)]
+    response = await client.post("/api/echo/bulk", json={"items": items})
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["items"]
+
+
+async def insert_directly(count):
+    """Servisni chetlab o'tib yozish - strategiya bu haqda bilmaydi"""
+    async with core_db.engine.begin() as conn:
+        await conn.execute(Echo.__table__.insert(), [
+            {"id": core_db.new_uuid(), "message": "to'g'ridan", "processed_message": "nadir'g'ot"}
+            for _ in range(count)
+        ])
+
+
+async def total(client, **params):
+    response = await client.get("/api/echo/", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()["total"]
+
+
+async def sqlite_analyze():
+    async with core_db.engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+
+
+def test_strategy_by_name():
+    assert type(get_count_strategy("exact")) is ExactCount
+    assert type(get_count_strategy("Cached")) is CachedCount
+    assert type(get_count_strategy("estimated")) is EstimatedCount
+    with pytest.raises(ValueError):
+        get_count_strategy("unknown")
+
+
+async def test_cached_count_is_invalidated_by_writes(counter, client):
+    cached = counter(CachedCount(ttl=60))
+    created = await create(client, 2)
+    assert await total(client) == 2
+
+    # Servisdan tashqaridagi yozuv TTL davomida ko'rinmaydi
+    await insert_directly(3)
+    assert await total(client) == 2
+
+    generation = cached._generations[TABLE]
+    await create(client, 1)
+    assert cached._generations[TABLE] == generation + 1
+    assert await total(client) == 6
+
+    assert (await client.delete(f"/api/echo/{created[0]['id']}", headers=AUTH)).status_code == 200
+    assert cached._generations[TABLE] == generation + 2
+    assert await total(client) == 5
+
+
+async def test_cached_count_keys_by_filters(counter, client):
+    cached = counter(CachedCount(ttl=60, max_size=2))
+    await create(client, 2, category="demo")
+    await create(client, 1, category="test")
+
+    assert await total(client, category="demo") == 2
+    assert await total(client, category="test") == 1
+    assert await total(client) == 3
+    # Chegaralangan kesh: uchinchi kalit eng eskisini chiqaradi
+    assert cached._cache.stats()["size"] == 2
+    assert cached._cache.evictions == 1
+
+
+async def test_estimated_count_uses_sqlite_stat(counter, client):
+    counter(EstimatedCount())
+    await create(client, 4)
+    await sqlite_analyze()
+    await insert_directly(2)
+
+    # Statistika ANALYZE paytidagi holatni ko'rsatadi
+    assert await total(client) == 4
+
+
+async def test_estimated_count_is_exact_when_filtered(counter, client):
+    counter(EstimatedCount())
+    await create(client, 3, category="demo")
+    await create(client, 2)
+    await sqlite_analyze()
+    await insert_directly(1)
+
+    assert await total(client, category="demo") == 3
+    assert await total(client, is_protected="false") == 6
+
+
+async def test_estimated_count_without_stat_row_is_exact(counter, client):
+    counter(EstimatedCount())
+    # Jadval bo'sh paytdagi ANALYZE - echo_items indeksi uchun qator yo'q
+    await sqlite_analyze()
+    async with core_db.engine.connect() as conn:
+        rows = (await conn.exec_driver_sql(
+            "SELECT count(*) FROM sqlite_stat1 WHERE tbl = ?", (TABLE,)
+        )).scalar()
+    assert rows == 0
+
+    await create(client, 3)
+    assert await total(client) == 3
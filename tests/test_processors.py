@@ -0,0 +1,86 @@
+"""
+Xabarlarni qayta ishlovchilar zanjiri (register_processor, ProcessorPipeline)
+"""
+
+import os
+
+import pytest
+
+from modules.echo import funcs
+from modules.echo.funcs import PROCESSORS, Processor, ProcessorPipeline, register_processor
+
+
+class PidProcessor(Processor):
+    """Xabarga uni qayta ishlagan jarayon PID'ini qo'shadi (jarayonlar pool'ida ham import qilinadi)"""
+    name = "test_pid"
+    cpu_bound = True
+
+    def process_many(self, messages):
+        return [f"{message}:{os.getpid()}" for message in messages]
+
+
+@pytest.fixture
+def pid_processor(monkeypatch):
+    monkeypatch.setitem(PROCESSORS, PidProcessor.name, PidProcessor())
+    return PidProcessor.name
+
+
+def test_register_processor_adds_to_registry(monkeypatch):
+    monkeypatch.setattr(funcs, "PROCESSORS", dict(PROCESSORS))
+
+    @register_processor
+    class UpperProcessor(Processor):
+        name = "test_upper"
+
+        def process(self, message):
+            return message.upper()
+
+    assert isinstance(funcs.PROCESSORS["test_upper"], UpperProcessor)
+    assert ProcessorPipeline(["test_upper", "reverse"]).process_many(["abc", "de"]) == ["CBA", "ED"]
+
+
+def test_chain_runs_in_order():
+    pipeline = ProcessorPipeline(["strip", "lower", "reverse"])
+    assert pipeline.process_many(["  Salom ", "DUNYO"]) == ["molas", "oynud"]
+
+
+def test_unknown_processor_fails_on_start():
+    pipeline = ProcessorPipeline(["reverse", "missing"])
+    with pytest.raises(ValueError, match="missing"):
+        pipeline.start()
+
+
+async def test_without_workers_runs_in_process(pid_processor):
+    pipeline = ProcessorPipeline([pid_processor], offload_min_batch=1)
+    pipeline.start(workers=0)
+    try:
+        assert await pipeline.run(["a", "b"]) == [f"a:{os.getpid()}", f"b:{os.getpid()}"]
+    finally:
+        pipeline.stop()
+
+
+async def test_light_chain_does_not_start_pool():
+    pipeline = ProcessorPipeline(["reverse"], offload_min_batch=1)
+    pipeline.start(workers=2)
+    try:
+        assert pipeline._executor is None
+        assert await pipeline.run(["abc"]) == ["cba"]
+    finally:
+        pipeline.stop()
+
+
+async def test_cpu_bound_batches_are_offloaded(pid_processor):
+    pipeline = ProcessorPipeline([pid_processor], offload_min_batch=3)
+    pipeline.start(workers=1)
+    try:
+        # Kichik paket joyida, katta paket jarayonlar pool'ida
+        small = await pipeline.run(["a", "b"])
+        large = await pipeline.run(["a", "b", "c"])
+    finally:
+        pipeline.stop()
+
+    assert small == [f"a:{os.getpid()}", f"b:{os.getpid()}"]
+    pids = {message.rsplit(":", 1)[1] for message in large}
+    assert len(pids) == 1 and pids != {str(os.getpid())}
+    assert [message.rsplit(":", 1)[0] for message in large] == ["a", "b", "c"]
+    assert pipeline._executor is None
@@ -0,0 +1,119 @@
+"""
+Echo ro'yxati so'rovlarining SQLite rejalari
+Ro'yxat, kursor, total va kategoriya so'rovlari qisman (deleted_at IS NULL)
+indekslardan foydalanishi, echo_items jadvalini to'liq o'qimasligi kerak
+"""
+
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from sqlalchemy import event
+
+from core import db as core_db
+
+
+@contextmanager
+def captured_selects():
+    """Ilova bajargan echo_items SELECT'larini (sql, parametrlar) yig'ish"""
+    statements: List[Tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "echo_items" in statement:
+            statements.append((statement, parameters))
+
+    engines = [core_db.engine.sync_engine]
+    if core_db.sqlite_reader_engine is not None:
+        engines.append(core_db.sqlite_reader_engine.sync_engine)
+    for sync_engine in engines:
+        event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        for sync_engine in engines:
+            event.remove(sync_engine, "before_cursor_execute", capture)
+
+
+async def query_plan(statement: str, parameters: tuple) -> List[str]:
+    async with core_db.engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row.detail for row in result]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    # "SCAN echo_items USING [COVERING] INDEX ..." - indeks bo'yicha o'qish;
+    # indekssiz "SCAN echo_items" - butun jadval
+    return [detail for detail in plan if detail.strip() == "SCAN echo_items"]
+
+
+async def create_items(client, count: int = 5) -> None:
+    items = [
+        {"message": f"xabar {i}", "category": "demo" if i % 2 else "test"}
+        for i in range(count)
+    ]
+    response = await client.post("/api/echo/bulk", json={"items": items})
+    assert response.status_code == 200, response.text
+
+
+async def assert_no_full_scans(client, path: str, params: dict) -> None:
+    with captured_selects() as statements:
+        response = await client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    assert statements, "so'rov bajarilmadi"
+    for statement, parameters in statements:
+        plan = await query_plan(statement, parameters)
+        assert not full_scans(plan), f"{statement}\n{plan}"
+
+
+async def test_list_and_count_use_live_index(client):
+    await create_items(client)
+    await assert_no_full_scans(client, "/api/echo/", {"page_size": 2})
+
+
+async def test_ascending_list_uses_live_index(client):
+    await create_items(client)
+    await assert_no_full_scans(client, "/api/echo/", {"page_size": 2, "order": "asc"})
+
+
+async def test_cursor_seek_uses_live_index(client):
+    await create_items(client)
+    first = await client.get("/api/echo/", params={"page_size": 2})
+    cursor = first.json()["next_cursor"]
+    assert cursor
+    await assert_no_full_scans(client, "/api/echo/", {"page_size": 2, "cursor": cursor})
+
+
+async def test_category_filter_uses_live_index(client):
+    await create_items(client)
+    await assert_no_full_scans(client, "/api/echo/", {"page_size": 2, "category": "demo"})
+
+
+async def test_category_cursor_seek_uses_live_index(client):
+    await create_items(client)
+    first = await client.get("/api/echo/", params={"page_size": 1, "category": "demo"})
+    cursor = first.json()["next_cursor"]
+    assert cursor
+    await assert_no_full_scans(
+        client, "/api/echo/", {"page_size": 1, "category": "demo", "cursor": cursor}
+    )
+
+
+async def index_names():
+    async with core_db.engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'echo_items'"
+        )
+        return {row.name for row in result}
+
+
+async def test_superseded_indexes_are_dropped(client):
+    # Oldingi versiya yaratgan indekslar
+    async with core_db.engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE INDEX ix_echo_items_id ON echo_items (id)")
+        await conn.exec_driver_sql("CREATE INDEX ix_echo_items_created_at_id ON echo_items (created_at, id)")
+
+    assert await core_db.create_tables()
+    names = await index_names()
+    assert not names & {"ix_echo_items_id", "ix_echo_items_created_at_id"}
+    assert core_db.live_index_name("echo_items", "created_at", "id") in names
+    # Qayta ishga tushirish xatosiz
+    assert await core_db.create_tables()
@@ -0,0 +1,38 @@
+"""
+O'qish handlerlari ulanishni javob serializatsiyasidan oldin pool'ga qaytaradi
+"""
+
+import pytest
+
+from core import db as core_db
+from core.settings import settings
+from modules.echo import router as echo_router
+
+
+@pytest.fixture
+def checkedout_at_serialization(monkeypatch):
+    """model_response chaqirilgan paytdagi band ulanishlar soni"""
+    counts = []
+    model_response = echo_router.model_response
+
+    def record(*args, **kwargs):
+        counts.append(core_db.engine.sync_engine.pool.checkedout())
+        return model_response(*args, **kwargs)
+
+    monkeypatch.setattr(echo_router, "model_response", record)
+    return counts
+
+
+@pytest.mark.parametrize("parallel_reads", [True, False], ids=["parallel", "sequential"])
+@pytest.mark.parametrize("path", ["/api/echo/", "/api/echo/search?q=salom", "/api/echo/{id}"])
+async def test_connection_is_released_before_serialization(
+    checkedout_at_serialization, client, monkeypatch, path, parallel_reads
+):
+    # Ketma-ket rejimda so'rovlar handler sessiyasining o'zida bajariladi
+    monkeypatch.setattr(settings, "DB_PARALLEL_READS", parallel_reads)
+    created = (await client.post("/api/echo/", json={"message": "salom"})).json()["data"]
+    checkedout_at_serialization.clear()
+
+    response = await client.get(path.format(id=created["id"]))
+    assert response.status_code == 200, response.text
+    assert checkedout_at_serialization == [0]
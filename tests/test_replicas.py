@@ -0,0 +1,100 @@
+"""
+O'qish replikalari: round-robin, sticky cookie va kesh
+Ikki replika - alohida SQLite fayllari; har birida o'z yozuvi bor, shuning
+uchun javobdan qaysi bazadan o'qilgani ko'rinadi
+"""
+
+import itertools
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+import httpx
+
+from core import db as core_db
+from core.db import REPLICA_STICKY_COOKIE, Base, new_uuid
+from middleware.replica import ReplicaStickyMiddleware
+from modules.echo.models import Echo
+from modules.echo.services import echo_service
+
+
+@pytest.fixture
+async def replicas(tmp_path, monkeypatch):
+    """Ikki replika engine'i, har birida bitta "replica N" yozuvi (client'dan oldin so'ralishi kerak)"""
+    engines, ids = [], []
+    for n in range(2):
+        replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'replica{n}.db'}")
+        item_id = new_uuid()
+        async with replica.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(Echo.__table__.insert().values(
+                id=item_id, message=f"replica {n}", processed_message=f"{n} acilper"
+            ))
+        engines.append(replica)
+        ids.append(str(item_id))
+
+    monkeypatch.setattr(core_db, "replica_engines", engines)
+    monkeypatch.setattr(core_db, "_replica_cycle", itertools.cycle(engines))
+    yield ids
+    for replica in engines:
+        await replica.dispose()
+
+
+def messages(response):
+    assert response.status_code == 200, response.text
+    return [item["message"] for item in response.json()["items"]]
+
+
+async def test_reads_alternate_between_replicas(replicas, client):
+    pages = [messages(await client.get("/api/echo/")) for _ in range(4)]
+    assert pages == [["replica 0"], ["replica 1"], ["replica 0"], ["replica 1"]]
+
+
+async def test_sticky_cookie_reads_from_primary(replicas, client):
+    created = await client.post("/api/echo/", json={"message": "asosiy"})
+    assert created.status_code == 200
+
+    client.cookies.set(REPLICA_STICKY_COOKIE, "1")
+    try:
+        assert messages(await client.get("/api/echo/")) == ["asosiy"]
+        item_id = created.json()["data"]["id"]
+        assert (await client.get(f"/api/echo/{item_id}")).status_code == 200
+    finally:
+        client.cookies.clear()
+    assert messages(await client.get("/api/echo/")) in (["replica 0"], ["replica 1"])
+
+
+async def test_replica_reads_do_not_fill_cache(replicas, client):
+    await echo_service.cache.clear()
+    first, second = replicas
+
+    # Round-robin: birinchi so'rov replica 0 ga, ikkinchisi replica 1 ga
+    assert (await client.get(f"/api/echo/{first}")).status_code == 200
+    missing = await client.get(f"/api/echo/{first}")
+    assert missing.status_code == 404
+    assert echo_service.cache.stats()["size"] == 0
+
+    # Asosiy bazadan o'qilgan yozuv keshga tushadi
+    created = (await client.post("/api/echo/", json={"message": "asosiy"})).json()["data"]
+    client.cookies.set(REPLICA_STICKY_COOKIE, "1")
+    try:
+        assert (await client.get(f"/api/echo/{created['id']}")).status_code == 200
+    finally:
+        client.cookies.clear()
+    assert echo_service.cache.stats()["size"] == 1
+
+
+async def test_sticky_middleware_sets_cookie_after_writes():
+    async def endpoint(request):
+        return PlainTextResponse("ok", status_code=int(request.query_params.get("status", 200)))
+
+    app = ReplicaStickyMiddleware(
+        Starlette(routes=[Route("/", endpoint, methods=["GET", "POST", "DELETE"])]), max_age=7
+    )
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        written = await c.post("/")
+        assert written.headers["set-cookie"].startswith(f"{REPLICA_STICKY_COOKIE}=1; Max-Age=7")
+        assert "set-cookie" not in (await c.get("/")).headers
+        assert "set-cookie" not in (await c.delete("/", params={"status": 404})).headers
@@ -0,0 +1,88 @@
+"""
+To'liq matnli qidiruv (GET /api/echo/search, SQLite FTS5)
+"""
+
+from core import db as core_db
+from core.db import create_tables
+from core.settings import settings
+
+AUTH = {"Authorization": f"Bearer {settings.BEARER_TOKEN}"}
+
+
+async def create(client, *items):
+    response = await client.post("/api/echo/bulk", json={"items": list(items)})
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["items"]
+
+
+async def search(client, q, **params):
+    response = await client.get("/api/echo/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return [item["message"] for item in body["items"]], body["total"]
+
+
+async def fts_rows():
+    async with core_db.engine.connect() as conn:
+        return (await conn.exec_driver_sql("SELECT count(*) FROM echo_items_fts")).scalar()
+
+
+async def test_results_are_ranked_by_bm25(client):
+    # Qisqa hujjat yuqoriroq: vaqt bo'yicha (yangisi birinchi) tartib teskari bo'lardi
+    await create(
+        client,
+        {"message": "olma"},
+        {"message": "olma nok banan uzum anor"},
+        {"message": "nok"},
+    )
+    assert await search(client, "olma") == (["olma", "olma nok banan uzum anor"], 2)
+    assert await search(client, "olma nok") == (["olma nok banan uzum anor"], 1)
+
+
+async def test_search_with_category(client):
+    await create(
+        client,
+        {"message": "salom dunyo", "category": "demo"},
+        {"message": "salom olam", "category": "test"},
+        {"message": "salom", "category": None},
+    )
+    assert await search(client, "salom", category="DEMO") == (["salom dunyo"], 1)
+    messages, total = await search(client, "salom")
+    assert total == 3 and sorted(messages) == ["salom", "salom dunyo", "salom olam"]
+
+
+async def test_soft_deleted_echo_leaves_index(client):
+    kept, deleted = await create(client, {"message": "salom dunyo"}, {"message": "salom olam"})
+    assert await fts_rows() == 2
+
+    assert (await client.delete(f"/api/echo/{deleted['id']}", headers=AUTH)).status_code == 200
+    assert await search(client, "salom") == (["salom dunyo"], 1)
+    assert await search(client, "olam") == ([], 0)
+    assert await fts_rows() == 1
+
+
+async def test_query_syntax_is_not_interpreted(client):
+    await create(client, {"message": 'u "qo\'shtirnoq" va NOT yozdi'})
+    assert (await search(client, '"qo\'shtirnoq" NOT'))[1] == 1
+    assert await search(client, "OR") == ([], 0)
+
+
+async def test_ensure_fts_backfills_existing_database(client):
+    kept, deleted = await create(client, {"message": "eski xabar"}, {"message": "eski o'chirilgan"})
+    assert (await client.delete(f"/api/echo/{deleted['id']}", headers=AUTH)).status_code == 200
+
+    # FTS jadvali paydo bo'lishidan oldingi baza
+    async with core_db.engine.begin() as conn:
+        await conn.exec_driver_sql("DROP TABLE echo_items_fts")
+        for trigger in ("insert", "update", "delete"):
+            await conn.exec_driver_sql(f"DROP TRIGGER echo_items_fts_{trigger}")
+
+    assert await create_tables()
+    assert await search(client, "eski") == (["eski xabar"], 1)
+
+    # Triggerlar qayta yaratilgan, takroriy ishga tushirish ikki marta to'ldirmaydi
+    await create(client, {"message": "yangi xabar"})
+    assert await create_tables()
+    assert await fts_rows() == 2
+    # Bir xil reyting - yangisi birinchi
+    assert await search(client, "xabar") == (["yangi xabar", "eski xabar"], 2)
@@ -0,0 +1,62 @@
+"""
+Echo javoblarini serializatsiya qilish (to_response, model_response)
+"""
+
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from modules.echo.schemas import EchoResponse
+from modules.echo.services import to_response
+from shared.schemas.common import PaginatedResponse, PaginationParams, ResponseModel
+from utils.helpers import model_response
+
+
+def make_row(**overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        created_at=datetime(2024, 1, 2, 3, 4, 5, 678901),
+        updated_at=datetime(2024, 1, 2, 3, 4, 6),
+        message="salom \"dunyo\" ✓",
+        category=None,
+        processed_message="✓ \"oyund\" molas",
+        is_protected=True,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_to_response_matches_validated_schema():
+    row = make_row()
+    fast = to_response(row)
+    validated = EchoResponse.model_validate(row, from_attributes=True)
+    assert fast == validated
+    assert fast.model_dump_json() == validated.model_dump_json()
+
+
+def test_model_response_sends_schema_json():
+    rows = [make_row(category="demo"), make_row()]
+    page = PaginatedResponse[EchoResponse].create(
+        [to_response(row) for row in rows], 2, PaginationParams()
+    )
+    response = model_response(page, headers={"ETag": 'W/"x"'}, status_code=201)
+
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == 'W/"x"'
+    body = json.loads(response.body)
+    assert body == json.loads(page.model_dump_json())
+    assert [item["id"] for item in body["items"]] == [str(row.id) for row in rows]
+
+
+async def test_api_responses_match_response_model(client):
+    created = await client.post("/api/echo/", json={"message": "salom", "category": "demo"})
+    item = ResponseModel[EchoResponse].model_validate(created.json()).data
+
+    fetched = await client.get(f"/api/echo/{item.id}")
+    assert fetched.headers["content-type"] == "application/json"
+    assert ResponseModel[EchoResponse].model_validate(fetched.json()).data.id == item.id
+
+    listed = PaginatedResponse[EchoResponse].model_validate((await client.get("/api/echo/")).json())
+    assert [echo.id for echo in listed.items] == [item.id]
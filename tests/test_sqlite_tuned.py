@@ -0,0 +1,73 @@
+"""
+SQLITE_TUNED rejimi (WAL, yagona yozuvchi, alohida o'quvchilar pool'i)
+Engine'lar import paytida sozlamalardan yaratiladi, shuning uchun ilova
+alohida jarayonda APP_SQLITE_TUNED=true bilan ishga tushiriladi
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPT = textwrap.dedent("""
+    import asyncio
+
+    import httpx
+
+    from app import app
+    from core import db as core_db
+
+
+    async def main():
+        assert core_db.SQLITE_TUNED and core_db.sqlite_reader_engine is not None
+        async with app.router.lifespan_context(app):
+            # Birinchi GET'dan oldin o'quvchilar engine'i isitilgan
+            assert core_db.sqlite_reader_engine.sync_engine.pool.checkedin() == 1
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                listed = await client.get("/api/echo/")
+                assert listed.status_code == 200, listed.text
+                assert listed.json()["total"] == 0
+
+                items = [{"message": f"xabar {i}"} for i in range(5)]
+                created = await client.post("/api/echo/bulk", json={"items": items})
+                assert created.status_code == 200, created.text
+                writes = [client.post("/api/echo/", json={"message": f"yana {i}"}) for i in range(10)]
+                reads = [client.get("/api/echo/", params={"page_size": 2}) for _ in range(10)]
+                responses = await asyncio.gather(*writes, *reads)
+                assert all(response.status_code == 200 for response in responses)
+
+                listed = await client.get("/api/echo/", params={"page_size": 100})
+                assert listed.json()["total"] == 15
+                assert len(listed.json()["items"]) == 15
+        print("ok")
+
+
+    asyncio.run(asyncio.wait_for(main(), 30))
+""")
+
+
+def test_tuned_mode_serves_parallel_reads_and_writes(tmp_path):
+    env = {
+        **os.environ,
+        "APP_SQLITE_TUNED": "true",
+        "APP_DB_PARALLEL_READS": "true",
+        "APP_DB_USE_PGSQL": "false",
+        "APP_DEBUG": "false",
+        "APP_SQLITE_DB_PATH": str(tmp_path / "tuned.db"),
+        "APP_LOG_FILE": str(tmp_path / "app.log"),
+        "APP_ACCESS_LOG_FILE": str(tmp_path / "access.log"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-3000:]
+    assert result.stdout.strip().endswith("ok")
+    # WAL rejimi bazada saqlanib qoladi
+    with sqlite3.connect(tmp_path / "tuned.db") as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
@@ -1,3 +1,125 @@
 """Yordamchi funksiyalar"""
 
-# Bu yerda umumiy yordamchi funksiyalar (helperlar) bo‘ladi
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+from fastapi import Response
+from pydantic import BaseModel
+
+from core.settings import settings
+
+# Imzoning qisqartirilgan uzunligi (baytlarda)
+CURSOR_SIGNATURE_SIZE = 16
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    key = settings.CURSOR_SECRET.encode("utf-8")
+    return hmac.new(key, payload, hashlib.sha256).digest()[:CURSOR_SIGNATURE_SIZE]
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Qiymatlar ro'yxatidan imzolangan, mijoz uchun shaffof bo'lmagan kursor yasash
+    Qiymatlar JSON ga o'giriladigan bo'lishi kerak
+    """
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Kursorni tekshirish va qiymatlarini qaytarish
+    Imzo noto'g'ri yoki format buzilgan bo'lsa ValueError ko'tariladi
+    """
+    try:
+        payload_part, signature_part = cursor.split(".", 1)
+        payload = _b64decode(payload_part)
+        signature = _b64decode(signature_part)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Kursor formati noto'g'ri") from e
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError("Kursor imzosi noto'g'ri")
+
+    values = json.loads(payload)
+    if not isinstance(values, list):
+        raise ValueError("Kursor formati noto'g'ri")
+    return values
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Qismlardan kuchsiz (weak) ETag yasash
+    Kuchsiz, chunki bir xil resurs siqilgan/siqilmagan holda ham yuborilishi mumkin
+    """
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode("utf-8"),
+        digest_size=12,
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match sarlavhasini ETag bilan kuchsiz solishtirish"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == target
+        for candidate in if_none_match.split(",")
+    )
+
+
+def as_utc(value: datetime) -> datetime:
+    """Vaqtni UTC ga keltirish (timezone'siz qiymatlar UTC deb hisoblanadi)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    """Last-Modified uchun HTTP sana formati"""
+    return format_datetime(as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """If-Modified-Since dan keyin resurs o'zgarmaganmi (soniya aniqligida)"""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return as_utc(last_modified).replace(microsecond=0) <= as_utc(since)
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Pydantic modelni tayyor JSON baytlari bilan qaytarish
+    Response qaytarilganda FastAPI response_model bo'yicha qayta validatsiya
+    va serializatsiya qilmaydi; model_dump_json esa pydantic-core'da bajariladi
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )